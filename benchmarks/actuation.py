@@ -0,0 +1,87 @@
+"""
+Micro-benchmark of the actuation of the motors in `ChronoEnvironment.step`.
+
+It compares the number of steps per second of the current actuation, where
+each motor keeps a constant function whose value is updated at each step,
+with the previous actuation, where a new python setpoint callback was
+created for each motor at each step.
+
+Usage:
+    python -m benchmarks.actuation --creature quadrupede --steps 2000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pychrono as chrono
+
+from walkingsim.envs.chrono import ChronoEnvironment
+from walkingsim.loader import EnvironmentProps
+
+
+class _SetpointTorqueFunction(chrono.ChFunction_SetpointCallback):
+    def __init__(self, value: float):
+        super().__init__()
+        self.__value = value
+
+    def SetpointCallback(self, t: float):
+        return self.__value
+
+
+def _legacy_step(env: ChronoEnvironment, action, timestep: float):
+    # Replace the functions of the motors before the step, the values set by
+    # `step` on the constant functions are then ignored by the motors.
+    funcs = [_SetpointTorqueFunction(value) for value in action.tolist()]
+    for motor, func in zip(env.creature.motors(), funcs):
+        motor.SetTorqueFunction(func)
+
+    env.step(action, timestep)
+    return funcs
+
+
+def _run(step, env_props: dict, creature: str, actions, timestep: float):
+    env = ChronoEnvironment(creature=creature)
+    env.reset(env_props)
+
+    start = time.perf_counter()
+    for action in actions:
+        step(env, action, timestep)
+    elapsed = time.perf_counter() - start
+
+    env.close()
+    return len(actions) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--creature", default="quadrupede")
+    parser.add_argument("--environment", default="default")
+    parser.add_argument("--timestep", type=float, default=1e-3)
+    parser.add_argument("--steps", type=int, default=2000)
+    args = parser.parse_args()
+
+    env_props = EnvironmentProps("./environments").load(args.environment)
+    shape = ChronoEnvironment(creature=args.creature).creature_shape
+    actions = np.random.default_rng(0).uniform(
+        -1000, 1000, (args.steps, shape)
+    )
+
+    before = _run(
+        _legacy_step, env_props, args.creature, actions, args.timestep
+    )
+    after = _run(
+        ChronoEnvironment.step,
+        env_props,
+        args.creature,
+        actions,
+        args.timestep,
+    )
+
+    print(f"setpoint callbacks : {before:10.1f} steps/s")
+    print(f"constant functions : {after:10.1f} steps/s")
+    print(f"speedup            : {after / before:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
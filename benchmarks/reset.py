@@ -0,0 +1,79 @@
+"""
+Consistency check of the reuse of a simulation by the GA workers.
+
+Each worker keeps a single `GA_Simulation` and calls `reset` before every
+genome. A genome is simulated in a fresh simulation, then again in a reused
+one, after other genomes. The fitness and the reward properties of the
+reused simulation are compared with the fresh one, the check fails when
+they differ by more than `--tolerance`.
+
+The parallel evaluation and the fitness cache expect the result of a
+genome not to depend on the previous simulations of the worker, the
+difference is expected to be 0.
+
+Usage:
+    python -m benchmarks.reset --creature quadrupede --genomes 3
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from walkingsim.loader import EnvironmentProps
+from walkingsim.simulation.ga import GA_Simulation
+
+
+def _simulate(simulation: GA_Simulation, forces):
+    fitness, props = simulation.simulate(forces)[:2]
+    return np.array([fitness, *props.values()], dtype=np.float64)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--creature", default="quadrupede")
+    parser.add_argument("--environment", default="default")
+    parser.add_argument("--timestep", type=float, default=1e-2)
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--cycle-timesteps", type=int, default=500)
+    parser.add_argument("--genomes", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0)
+    args = parser.parse_args()
+
+    env_props = EnvironmentProps("./environments").load(args.environment)
+    sim_kwargs = dict(
+        env_props=env_props,
+        creature=args.creature,
+        timestep=args.timestep,
+        duration=args.duration,
+    )
+    simulation = GA_Simulation(**sim_kwargs)
+    genomes = np.random.default_rng(0).uniform(
+        -1,
+        1,
+        (args.genomes, args.cycle_timesteps, simulation.creature_shape),
+    )
+
+    failed = False
+    for i, forces in enumerate(genomes):
+        fresh_simulation = GA_Simulation(**sim_kwargs)
+        fresh = _simulate(fresh_simulation, forces)
+        fresh_simulation.close()
+
+        # The reused simulation has already simulated the previous genomes
+        reused = _simulate(simulation, forces)
+        deviation = float(np.max(np.abs(reused - fresh)))
+        print(
+            f"genome {i}: fitness {reused[0]:.6f} (fresh {fresh[0]:.6f}),"
+            f" max deviation {deviation:.3e}"
+        )
+        failed = failed or deviation > args.tolerance
+
+    simulation.close()
+    if failed:
+        print(f"FAIL: deviation above {args.tolerance:.3e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Startup-time regression check of the command line interface.
+
+It runs `python -X importtime -m walkingsim <args>` several times and
+reports the median wall-clock time and cumulative import time. It also lists
+the heavy modules imported on the way. The check fails when one of the
+forbidden modules is imported or when the median exceeds `--max-ms`.
+
+Usage:
+    python -m benchmarks.startup --runs 5 --max-ms 500
+    python -m benchmarks.startup --args "env list"
+"""
+
+import argparse
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules that only the commands running a simulation may import
+FORBIDDEN = ("numpy", "pychrono", "stable_baselines3", "torch", "pygad")
+
+
+def _run(args: list):
+    """Returns the wall-clock time and the cumulative time of each import"""
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "walkingsim", *args],
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr)
+
+    imports = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            imports[name.strip()] = int(cumulative)
+
+    return elapsed, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--args", default="--help")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    command = shlex.split(args.args)
+    runs = [_run(command) for _ in range(args.runs)]
+    wall = statistics.median(elapsed for elapsed, _ in runs) * 1e3
+    imports = runs[-1][1]
+    # Only the top-level packages, their cumulative time includes the rest
+    total = sum(t for name, t in imports.items() if "." not in name) / 1e3
+
+    print(f"command      : walkingsim {args.args}")
+    print(f"wall-clock   : {wall:10.1f} ms (median of {args.runs})")
+    print(f"imports      : {total:10.1f} ms")
+    print("slowest imports:")
+    slowest = sorted(imports.items(), key=lambda item: item[1])[::-1]
+    for name, cumulative in slowest[:10]:
+        print(f"  {name:40} {cumulative / 1e3:10.1f} ms")
+
+    failures = [
+        f"`{name}` is imported" for name in FORBIDDEN if name in imports
+    ]
+    if args.max_ms is not None and wall > args.max_ms:
+        failures.append(f"{wall:.1f} ms is above {args.max_ms:.1f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 
 from gui.shell import ShellCommandDialog
+from walkingsim.utils.run_index import RunIndex
 
 
 class VisView(ttk.Frame):
@@ -78,11 +79,21 @@ class VisView(ttk.Frame):
         return cmd
 
     def _handle_select_algo_field(self, ev):
+        # Indexed runs are listed first (most recent first), followed by
+        # the runs saved before the index existed.
+        dates = [run["date"] for run in RunIndex(self.selected_algo).runs()]
         rootdir = os.path.join("solutions", self.selected_algo)
         if os.path.exists(rootdir):
-            self._solutions_var.set(os.listdir(rootdir))
-        else:
-            self._solutions_var.set([])
+            dates += sorted(
+                (
+                    entry.name
+                    for entry in os.scandir(rootdir)
+                    if entry.is_dir() and entry.name not in dates
+                ),
+                reverse=True,
+            )
+
+        self._solutions_var.set(dates)
 
         self._vis_btn.state(["disabled"])
 
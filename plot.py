@@ -1,9 +1,16 @@
-import pandas as pd
 import matplotlib.pyplot as plt
+import pandas as pd
+
+from walkingsim.utils.data_manager import DataManager
 
 algo, date = "ppo", "20230530-232400"
-results = pd.read_csv(f"./solutions/{algo}/{date}/logs/results.csv")
+columns = ["total_fitness", "height_diff", "distance"]
+# Works with both CSV and columnar logs, only the plotted columns are
+# read from columnar logs.
+results = pd.DataFrame(
+    DataManager(algo, date, False).load_log_file("results.csv", columns)
+)
 print(results.head())
 
-results.plot(y=["total_fitness", "height_diff", "distance"], kind='line')
-plt.show()
\ No newline at end of file
+results.plot(y=columns, kind="line")
+plt.show()
@@ -1,4 +1,3 @@
-import walkingsim.utils._logging  # Configure logging
 from walkingsim.cli.parser import WalkingSimArgumentParser
 
 if __name__ == "__main__":
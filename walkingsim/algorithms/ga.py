@@ -1,13 +1,21 @@
 import copy
+import math
+import os
+import random
 
 import numpy as np
 import pygad as pygad_
 import tqdm
 from loguru import logger
 
+from walkingsim.simulation.encoding import encodings
 from walkingsim.simulation.ga import GA_Simulation
+from walkingsim.simulation.pool import GA_SimulationPool
 from walkingsim.utils.data_manager import DataManager
+from walkingsim.utils.fitness_cache import FitnessCache
+from walkingsim.utils.profiling import PROFILER, ProfileLog
 from walkingsim.utils.pygad_config import PygadConfig
+from walkingsim.utils.run_index import RunIndex
 
 
 class GeneticAlgorithm:
@@ -17,6 +25,21 @@ class GeneticAlgorithm:
     """
 
     _dm_group = "ga"
+    # Gap between the fitness of two consecutive individuals that were not
+    # promoted by the coarse screening
+    _SCREENED_FITNESS_STEP = 1e-3
+    # Attributes of pygad restored when resuming from a checkpoint
+    _pygad_state = (
+        "generations_completed",
+        "population",
+        "last_generation_fitness",
+        "previous_generation_fitness",
+        "last_generation_parents",
+        "last_generation_parents_indices",
+        "last_generation_elitism",
+        "last_generation_elitism_indices",
+        "best_solutions_fitness",
+    )
 
     def __init__(
         self,
@@ -29,30 +52,99 @@ class GeneticAlgorithm:
         ending_delay: int = 0,
         timestep: float = 1e-2,
         best_solution=None,
+        solutions=None,
+        log_format: str = "csv",
+        render_interval: int = 1,
+        render_fps: float = None,
+        date: str = None,
     ):
-        self._dm = DataManager(self._dm_group)
+        self._dm = DataManager(self._dm_group, date, log_format=log_format)
+        self._log_format = log_format
         self._config = config._asdict()
 
         self.data_log = []
         self._env_props = env_props
         self._visualize = visualize
-        self._simulation = GA_Simulation(
-            env_props=self._env_props,
-            creature=creature,
-            fitness=fitness,
-            visualize=self._visualize,
-            ending_delay=ending_delay,
-            timestep=timestep,
-            duration=duration,
-        )
+        self._sim_kwargs = {
+            "env_props": self._env_props,
+            "creature": creature,
+            "fitness": fitness,
+            "visualize": self._visualize,
+            "ending_delay": ending_delay,
+            "timestep": timestep,
+            "duration": duration,
+            "render_interval": render_interval,
+            "render_fps": render_fps,
+        }
+        self._simulation = GA_Simulation(**self._sim_kwargs)
+        encoding_cls = encodings.get(config.encoding, None)
+        if encoding_cls is None:
+            raise RuntimeError(
+                f"Encoding `{config.encoding}` is invalid, possible values are `{encodings.keys()}`"
+            )
+        self._encoding = encoding_cls.from_config(config)
+
+        # Parallel evaluation, results computed by the pool are stored
+        # by genome until pygad asks for them in `fitness_function`.
+        self._pool = None
+        self._pool_results = {}
+
+        cache_context = {
+            "creature": creature,
+            "env": env_props,
+            "fitness": fitness,
+            "timestep": timestep,
+            "duration": duration,
+            "timesteps": config.timesteps,
+            **self._encoding.params,
+        }
+        self._cache = FitnessCache(config.cache_size, cache_context)
+        if config.persist_cache:
+            self._cache.load(self._dm)
+
+        # Multi-fidelity evaluation, the coarse simulation only follows one
+        # timestep of the cycle out of `stride`.
+        self._coarse_sim_kwargs = None
+        self._coarse_simulation = None
+        self._coarse_results = {}
+        if config.coarse_timestep is not None:
+            self._coarse_sim_kwargs = dict(
+                self._sim_kwargs,
+                visualize=False,
+                timestep=config.coarse_timestep,
+                duration=config.coarse_duration or duration,
+            )
+            self._coarse_stride = max(
+                1, round(config.coarse_timestep / timestep)
+            )
+            self._coarse_cache = FitnessCache(
+                config.cache_size,
+                dict(
+                    cache_context,
+                    timestep=config.coarse_timestep,
+                    duration=config.coarse_duration or duration,
+                ),
+            )
+
+        self._profile = ProfileLog(self._dm, "generation")
+
+        # History of the populations, written in a memory-mapped archive
+        # instead of being kept by pygad when `save_solutions` is set.
+        self._archive = None
+        self._solutions = None
+
+        # Fitness of the population of the checkpoint a run resumes from,
+        # it was already computed and logged before the interruption.
+        self._resumed_fitness = {}
 
         self.sim_data = {
             "config": config,
             "best_fitness": 0,
             "best_solution": best_solution,
-            "solutions": None,
+            "solutions": solutions,
             "creature": creature,
             "env": env_props,
+            "fitness": fitness,
         }
 
         self.ga = pygad_.GA(
@@ -60,7 +152,9 @@ class GeneticAlgorithm:
             initial_population=config.initial_population,
             sol_per_pop=config.population_size,
             num_generations=config.num_generations,
-            num_genes=self._simulation.creature_shape * config.timesteps,
+            num_genes=self._encoding.num_genes(
+                config.timesteps, self._simulation.creature_shape
+            ),
             # Evolution settings
             num_parents_mating=config.num_parents_mating,
             mutation_percent_genes=config.mutation_percent_genes,
@@ -70,15 +164,18 @@ class GeneticAlgorithm:
             keep_elitism=config.keep_elitism,
             # Execution settings
             parallel_processing=config.parallel_processing,
-            save_solutions=config.save_solutions,
+            save_solutions=False,
+            random_seed=config.random_seed,
             # Space
-            gene_space=config.gene_space,
+            gene_space=self._encoding.gene_space,
+            gene_type=self._encoding.gene_type,
             init_range_low=config.init_range_low,
             init_range_high=config.init_range_high,
             random_mutation_min_val=config.random_mutation_min_val,
             random_mutation_max_val=config.random_mutation_max_val,
             # Callbacks
             fitness_func=self.fitness_function,
+            on_start=self.on_start,
             on_crossover=self.on_crossover,
             on_mutation=self.on_mutation,
             on_generation=self._on_generation,
@@ -99,20 +196,83 @@ class GeneticAlgorithm:
             position=0,
         )
 
+    def on_start(self, ga_instance):
+        config = self.sim_data["config"]
+        if config.save_solutions:
+            if isinstance(self.sim_data["solutions"], dict):
+                self._archive = self._dm.load_local_memmap(
+                    "solutions.npy", "r+"
+                )
+            else:
+                self._archive = self._dm.create_local_memmap(
+                    "solutions.npy",
+                    (
+                        config.num_generations + 1,
+                        *ga_instance.population.shape,
+                    ),
+                    ga_instance.population.dtype,
+                )
+            self._archive_solutions(ga_instance.generations_completed)
+
+        if len(self._resumed_fitness) == 0:
+            self._evaluate_batch(ga_instance.population)
+
+    def _archive_solutions(self, generation: int):
+        self._archive[generation] = self.ga.population
+        self.sim_data["solutions"] = {
+            "date": self._dm.date,
+            "filename": "solutions.npy",
+            "generations": generation + 1,
+        }
+
     def on_crossover(self, ga_instance, offspring_crossover):
+        self._resumed_fitness.clear()
         self.progress_sims.reset(len(offspring_crossover))
         self.progress_sims.set_description(
             f"({self.ga.generations_completed}) Crossover"
         )
+        # The adaptive mutation needs the fitness of the offspring of the
+        # crossover before mutating them, they are evaluated as a batch
+        # instead of one by one when pygad asks for them.
+        if self.ga.mutation_type == "adaptive":
+            self._evaluate_batch(offspring_crossover)
 
     def on_mutation(self, ga_instance, offspring_mutation):
         self.progress_sims.reset(len(offspring_mutation))
         self.progress_sims.set_description(
             f"({self.ga.generations_completed}) Mutation"
         )
+        self._evaluate_batch(offspring_mutation)
 
     def _on_generation(self, ga_instance):
         self.progress_gens.update(1)
+        if self._archive is not None:
+            self._archive_solutions(ga_instance.generations_completed)
+
+        hits, misses = self._cache.pop_counters()
+        logger.info(
+            "Generation {}: {} cache hits, {} cache misses",
+            self.ga.generations_completed,
+            hits,
+            misses,
+        )
+        self._dm.save_log_file(
+            "fitness_cache.csv",
+            ["generation", "hits", "misses", "size"],
+            {
+                "generation": self.ga.generations_completed,
+                "hits": hits,
+                "misses": misses,
+                "size": len(self._cache),
+            },
+        )
+
+        if PROFILER.enabled:
+            self._profile.record(self.ga.generations_completed)
+
+        interval = self.sim_data["config"].checkpoint_interval
+        if interval > 0 and self.ga.generations_completed % interval == 0:
+            self._save_checkpoint()
 
     def on_stop(self, ga_instance, last_population_fitness):
         self.progress_sims.reset(
@@ -122,6 +282,153 @@ class GeneticAlgorithm:
             f"({self.ga.generations_completed}) Fitness"
         )
 
+    def _prune_kwargs(self):
+        """
+        Pruning arguments of the simulations. The threshold is the fitness of
+        the k-th best individual of the current population: as long as k is
+        not greater than the elitism, these individuals are kept in the next
+        population, so an individual that cannot beat it never reaches the
+        top-k.
+        """
+        config = self.sim_data["config"]
+        fitness = self.ga.last_generation_fitness
+        if not config.prune or fitness is None:
+            return {}
+
+        top_k = config.prune_top_k or config.keep_elitism
+        top_k = min(max(top_k, 1), len(fitness))
+        return {
+            "threshold": np.sort(fitness)[-top_k],
+            "checkpoints": config.prune_checkpoints,
+            "max_speed": config.prune_max_speed,
+        }
+
+    def _simulate_batch(self, genomes: list, coarse: bool = False, **kwargs):
+        """
+        Simulates the genomes on the pool of workers, or one after the other
+        when there is no pool.
+        """
+        if self._pool is not None:
+            yield from self._pool.imap(genomes, coarse=coarse, **kwargs)
+            return
+
+        simulation = self._simulation
+        if coarse:
+            if self._coarse_simulation is None:
+                self._coarse_simulation = GA_Simulation(
+                    **self._coarse_sim_kwargs
+                )
+            simulation = self._coarse_simulation
+
+        for genome in genomes:
+            forces_list = self._decode(genome)
+            with PROFILER.phase("ga.simulate"):
+                yield simulation.simulate(forces_list, **kwargs)
+
+    def _evaluate_batch(self, population):
+        """
+        Evaluates a whole batch of individuals on the pool of workers, the
+        results are then picked up by `fitness_function`.
+        """
+        self._pool_results.clear()
+        self._coarse_results.clear()
+        if self._pool is None and self._coarse_sim_kwargs is None:
+            return
+
+        genomes = {}
+        for individual in population:
+            key = self._cache.key(individual)
+            if key in genomes or key in self._pool_results:
+                continue
+
+            result = self._cache.get(key)
+            if result is None:
+                genomes[key] = individual
+            else:
+                self._pool_results[key] = (*result, False)
+
+        self.progress_sims.reset(len(genomes))
+        self.progress_sims.set_description(
+            f"({self.ga.generations_completed}) Fitness"
+        )
+        if self._coarse_sim_kwargs is not None:
+            genomes = self._screen(genomes)
+
+        results = self._simulate_batch(
+            list(genomes.values()), **self._prune_kwargs()
+        )
+        for key, result in zip(genomes.keys(), results):
+            # Pruned individuals don't have their final fitness
+            if not result[2]:
+                self._cache.put(key, *result[:2])
+            self._pool_results[key] = result
+            self.progress_sims.update(1)
+
+        if self._coarse_results:
+            self._rank_screened()
+
+    def _screen(self, genomes: dict) -> dict:
+        """
+        Simulates the genomes at the coarse timestep and returns the ones
+        promoted to the fine timestep, the best `promote_fraction`.
+        """
+        coarse = {}
+        simulated = {}
+        for key, genome in genomes.items():
+            result = self._coarse_cache.get(key)
+            if result is None:
+                simulated[key] = genome
+            else:
+                coarse[key] = result
+
+        results = self._simulate_batch(
+            list(simulated.values()), coarse=True, stride=self._coarse_stride
+        )
+        for key, result in zip(simulated.keys(), results):
+            self._coarse_cache.put(key, *result[:2])
+            coarse[key] = result[:2]
+            self.progress_sims.update(1)
+
+        config = self.sim_data["config"]
+        ranking = sorted(
+            genomes.keys(), key=lambda key: coarse[key][0], reverse=True
+        )
+        promoted = min(
+            max(1, math.ceil(config.promote_fraction * len(ranking))),
+            len(ranking),
+        )
+        for rank, key in enumerate(ranking):
+            self._coarse_results[key] = (*coarse[key], rank < promoted)
+
+        logger.info(
+            "Generation {}: {} individuals screened, {} promoted",
+            self.ga.generations_completed,
+            len(ranking),
+            promoted,
+        )
+        self.progress_sims.reset(promoted)
+        return {key: genomes[key] for key in ranking[:promoted]}
+
+    def _rank_screened(self):
+        """
+        Fitness of the individuals that were not promoted: they are ranked
+        below the worst promoted one, by order of coarse fitness. Only the
+        coarse rank is used, the coarse fitness isn't on the same scale as
+        the fine one.
+        """
+        min_fine = min(
+            self._pool_results[key][0]
+            for key, (_, _, is_promoted) in self._coarse_results.items()
+            if is_promoted
+        )
+        # The coarse results are stored by order of coarse fitness
+        rank = 0
+        for key, (_, props, is_promoted) in self._coarse_results.items():
+            if not is_promoted:
+                rank += 1
+                fitness = min_fine - rank * self._SCREENED_FITNESS_STEP
+                self._pool_results[key] = (fitness, props, False)
+
     def fitness_function(self, individual, solution_idx):
         """
         Calculate the fitness of an individual based on the sensor data
@@ -132,65 +439,119 @@ class GeneticAlgorithm:
             2) The solution's index within the population.
 
         """
-        self.progress_gens.refresh()
+        with PROFILER.phase("ga.progress"):
+            self.progress_gens.refresh()
         logger.debug("Simulation {}".format(solution_idx))
         logger.debug("Creature genome: {}".format(individual))
-        # Simulate the movement of the quadruped based on the movement matrix
-        # and the sensor data
-
-        forces_list = np.array(individual).reshape(
-            (
-                self.sim_data["config"].timesteps,
-                self._simulation.creature_shape,
-            )
-        )
-
-        self._simulation.reset()
-        while not self._simulation.is_over():
-            for forces in forces_list:
-                if self._simulation.is_over():
-                    break
-                self._simulation.step(forces)
 
-        fitness = self._simulation.reward
-        fitness_props = self._simulation.reward_props
+        key = self._cache.key(individual)
+        if key in self._resumed_fitness:
+            return self._resumed_fitness[key]
+
+        result = self._pool_results.get(key)
+        if result is None:
+            result = self._cache.get(key)
+            if result is not None:
+                result = (*result, False)
+
+        if result is None:
+            # Every batch is evaluated by the pool or screened, an
+            # individual missing here would be simulated serially in the
+            # main process, without screening.
+            assert (
+                self._pool is None and self._coarse_sim_kwargs is None
+            ), "Individual not evaluated by the pool or screened"
+
+            # Simulate the movement of the quadruped based on the movement
+            # matrix and the sensor data
+            forces_list = self._decode(individual)
+            with PROFILER.phase("ga.simulate"):
+                result = self._simulation.simulate(
+                    forces_list, **self._prune_kwargs()
+                )
+            if not result[2]:
+                self._cache.put(key, *result[:2])
+            with PROFILER.phase("ga.progress"):
+                self.progress_sims.update(1)
+
+        fitness, fitness_props, pruned = result
 
         logger.debug("Creature fitness: {}".format(fitness))
-        self.progress_gens.refresh()
-        self.progress_sims.update(1)
+        with PROFILER.phase("ga.progress"):
+            self.progress_gens.refresh()
 
         # Add entry in csv log
-        headers = ["generation", "specimen_id", "total_fitness"] + list(
-            fitness_props.keys()
-        )
-        data = copy.copy(fitness_props)
-        data["generation"] = self.ga.generations_completed
-        data["specimen_id"] = solution_idx
-        data["total_fitness"] = fitness
-        self._dm.save_log_file("results.csv", headers, data)
+        with PROFILER.phase("ga.log"):
+            headers = [
+                "generation",
+                "specimen_id",
+                "total_fitness",
+                "pruned",
+            ] + list(fitness_props.keys())
+            data = copy.copy(fitness_props)
+            data["generation"] = self.ga.generations_completed
+            data["specimen_id"] = solution_idx
+            data["total_fitness"] = fitness
+            data["pruned"] = pruned
+            if self._coarse_sim_kwargs is not None:
+                headers[4:4] = ["coarse_fitness", "promoted"]
+                coarse, _, promoted = self._coarse_results.get(
+                    key, (None, None, None)
+                )
+                data["coarse_fitness"] = coarse
+                data["promoted"] = promoted
+            self._dm.save_log_file("results.csv", headers, data)
 
         return fitness
 
+    @property
+    def solutions(self):
+        """
+        Populations of every generation (generation x individual x genes),
+        the archive is memory mapped when first accessed. None when the
+        solutions were not saved.
+        """
+        archive = self.sim_data["solutions"]
+        if not isinstance(archive, dict):
+            # Runs saved before the archive pickled the solutions
+            return archive
+
+        if self._solutions is None:
+            dm = DataManager(self._dm_group, archive["date"], False)
+            self._solutions = dm.load_local_memmap(archive["filename"])[
+                : archive["generations"]
+            ]
+
+        return self._solutions
+
     # save & load
     def save(self):
         """
-        Saves the final results dictionary in a .dat file.
-        Saves it as best if applicable.
+        Saves the final results dictionary in a .dat file and records the
+        run in the run index.
         """
         self._dm.save_log_file(
             "pygad_config.csv", list(self._config.keys()), self._config
         )
         self._dm.save_local_dat_file("sim_data.dat", self.sim_data)
-        self._dm.save_global_dat_file("last_sim.dat", self._dm.date)
+        self._profile.save()
+        self._dm.close()
+
+        index = RunIndex(self._dm_group)
+        index.add(
+            self._dm.date,
+            creature=self.sim_data["creature"],
+            env=self.sim_data["env"],
+            fitness=self.sim_data["fitness"],
+            best_fitness=self.sim_data["best_fitness"],
+            config=self.sim_data["config"],
+            seed=self.sim_data["config"].random_seed,
+            files=sorted(os.listdir(self._dm.get_local_path(""))),
+        )
 
-        try:
-            best_sim_date = self._dm.load_global_dat_file("best_sim.dat")
-            best_sim_data = DataManager(
-                self._dm_group, best_sim_date, False
-            ).load_local_dat_file("sim_data.dat")
-            if best_sim_data["best_fitness"] < self.sim_data["best_fitness"]:
-                self._dm.save_global_dat_file("best_sim.dat", self._dm.date)
-        except (EOFError, FileNotFoundError):
+        # The global files are still written for the older tools
+        self._dm.save_global_dat_file("last_sim.dat", self._dm.date)
+        if index.best() == self._dm.date:
             self._dm.save_global_dat_file("best_sim.dat", self._dm.date)
 
     @classmethod
@@ -201,31 +562,144 @@ class GeneticAlgorithm:
         timestep: float = 1e-2,
         ending_delay: int = 0,
     ):
+        """
+        Loads a saved run, the date can also be `last` (default) or `best`.
+        """
+        date = RunIndex(cls._dm_group).resolve(date)
         dm = DataManager(cls._dm_group, date, False)
-        if date is None:
-            best_sim_date = dm.load_global_dat_file("last_sim.dat")
-            dm = DataManager(cls._dm_group, best_sim_date, False)
 
         sim_data = dm.load_local_dat_file("sim_data.dat")
         return GeneticAlgorithm(
             config=sim_data["config"],
             env_props=sim_data["env"],
             creature=sim_data["creature"],
+            fitness=sim_data.get("fitness", "walking-v0"),
             visualize=visualize,
             ending_delay=ending_delay,
             timestep=timestep,
             best_solution=sim_data["best_solution"],
+            solutions=sim_data.get("solutions"),
+        )
+
+    # checkpoint & resume
+    def _save_checkpoint(self):
+        """
+        Saves everything needed to continue the run after the current
+        generation: the state of pygad, the state of the random generators
+        and the arguments of the simulation.
+        """
+        if self._archive is not None:
+            self._archive.flush()
+        # The cache is reused when resuming, it is saved with the checkpoint
+        # in case the run is killed.
+        if self.sim_data["config"].persist_cache:
+            self._cache.save(self._dm)
+
+        checkpoint = {
+            name: copy.deepcopy(getattr(self.ga, name))
+            for name in self._pygad_state
+        }
+        checkpoint["numpy_rng"] = np.random.get_state()
+        checkpoint["random_rng"] = random.getstate()
+        checkpoint["sim_kwargs"] = self._sim_kwargs
+        checkpoint["sim_data"] = self.sim_data
+        checkpoint["log_format"] = self._log_format
+        self._dm.save_local_checkpoint("checkpoint.dat", checkpoint)
+
+    @classmethod
+    def resume(cls, date: str, visualize: bool = False):
+        """
+        Loads the last checkpoint of a run, `train` then continues the run
+        in the same directory until the configured number of generations.
+        """
+        dm = DataManager(cls._dm_group, date, False)
+        checkpoint = dm.load_local_checkpoint("checkpoint.dat")
+
+        sim_data = checkpoint["sim_data"]
+        sim_kwargs = dict(checkpoint["sim_kwargs"], visualize=visualize)
+        model = GeneticAlgorithm(
+            config=sim_data["config"],
+            best_solution=sim_data["best_solution"],
+            solutions=sim_data["solutions"],
+            log_format=checkpoint["log_format"],
+            date=date,
+            **sim_kwargs,
         )
 
+        ga = model.ga
+        for name in cls._pygad_state:
+            setattr(ga, name, checkpoint[name])
+        np.random.set_state(checkpoint["numpy_rng"])
+        random.setstate(checkpoint["random_rng"])
+
+        # pygad runs `num_generations` more generations when resuming
+        ga.num_generations = sim_data["config"].num_generations - (
+            ga.generations_completed
+        )
+        model._resumed_fitness = {
+            model._cache.key(individual): fitness
+            for individual, fitness in zip(
+                ga.population, ga.last_generation_fitness
+            )
+        }
+        model.progress_gens.update(ga.generations_completed)
+        logger.info(
+            "Resuming {} after generation {}", date, ga.generations_completed
+        )
+        return model
+
     # train & visualize
     def train(self):
-        self.ga.run()
-        self._simulation.close()
+        # A run resumed from the checkpoint of its last generation has no
+        # generation left, pygad cannot run 0 generations.
+        finished = self.ga.num_generations <= 0
+        if finished:
+            logger.info(
+                "The {} generations are already completed",
+                self.ga.generations_completed,
+            )
+
+        workers = self.sim_data["config"].workers
+        if workers > 1 and not finished:
+            if self._visualize:
+                logger.warning("Rendering is disabled in the workers")
+
+            self._pool = GA_SimulationPool(
+                workers,
+                dict(self._sim_kwargs, visualize=False),
+                self.sim_data["config"].timesteps,
+                self._encoding,
+                self._coarse_sim_kwargs,
+            )
+
+        try:
+            if not finished:
+                self.ga.run()
+        except BaseException:
+            # The queued simulations are not waited for when the run fails
+            # or is interrupted
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool = None
+            raise
+        finally:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+            if self.sim_data["config"].persist_cache:
+                self._cache.save(self._dm)
+            if self._archive is not None:
+                self._archive.flush()
+                self._archive = None
+            self._simulation.close()
+            if self._coarse_simulation is not None:
+                self._coarse_simulation.close()
+                self._coarse_simulation = None
+            self._dm.flush_logs()
 
         best_solution, best_fitness, _ = self.ga.best_solution()
         self.sim_data["best_fitness"] = best_fitness
         self.sim_data["best_solution"] = best_solution
-        self.sim_data["solutions"] = self.ga.solutions
 
         logger.error("Best genome: {}".format(best_solution))
         logger.error("Best fitness: {}".format(best_fitness))
@@ -234,13 +708,46 @@ class GeneticAlgorithm:
         if self.progress_sims is not None:
             self.progress_sims.close()
 
-    def visualize(self):
-        forces_list = np.array(self.sim_data["best_solution"]).reshape(
-            (
-                self.sim_data["config"].timesteps,
-                self._simulation.creature_shape,
-            )
+    def _decode(self, genome):
+        return self._encoding.decode(
+            genome,
+            self.sim_data["config"].timesteps,
+            self._simulation.creature_shape,
+        )
+
+    def _get_best_forces(self):
+        return self._decode(self.sim_data["best_solution"])
+
+    def record(self, output: str, fps: float = 30, format: str = "auto"):
+        """
+        Replays the best solution once without any window loop and records
+        it, see `ChronoRecorder`. Returns the path of the recording.
+        """
+        from walkingsim.envs.chrono.recorder import ChronoRecorder
+
+        forces_list = self._get_best_forces()
+
+        # Standalone simulation keeping every observation, the trajectory is
+        # exported with the poses.
+        simulation = GA_Simulation(
+            **dict(self._sim_kwargs, visualize=False, record_trajectory=True)
         )
+        simulation.reset()
+        recorder = ChronoRecorder(simulation.environment, output, fps, format)
+        recorder.capture()
+        while not simulation.is_over():
+            for forces in forces_list:
+                if simulation.is_over():
+                    break
+                simulation.step(forces)
+                recorder.capture()
+
+        output = recorder.close(simulation.trajectory)
+        simulation.close()
+        return output
+
+    def visualize(self):
+        forces_list = self._get_best_forces()
 
         self._simulation.reset()
         while not self._simulation.is_closed():
@@ -0,0 +1,383 @@
+import collections
+import multiprocessing as mp
+import os
+import pickle
+import queue
+import socket
+import struct
+import threading
+
+import numpy as np
+from loguru import logger
+
+from walkingsim.algorithms.ga import GeneticAlgorithm
+from walkingsim.utils.data_manager import DataManager
+from walkingsim.utils.pygad_config import PygadConfig
+from walkingsim.utils.seeding import spawn_seeds
+
+
+# Transports
+class _QueueEndpoint:
+    def __init__(self, queues: list, island: int):
+        self._queues = queues
+        self._island = island
+
+    def send(self, island: int, message):
+        self._queues[island].put(message)
+
+    def receive(self, timeout: float):
+        try:
+            return self._queues[self._island].get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class QueueTransport:
+    """Migrations between local processes through multiprocessing queues"""
+
+    def __init__(self, n_islands: int):
+        context = mp.get_context("spawn")
+        self._queues = [context.Queue() for _ in range(n_islands)]
+
+    def endpoint(self, island: int):
+        return _QueueEndpoint(self._queues, island)
+
+    def close(self):
+        pass
+
+
+_HEADER = struct.Struct("!Q")
+
+
+def _send_message(sock: socket.socket, message):
+    data = pickle.dumps(message)
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, size: int):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data.extend(chunk)
+
+    return bytes(data)
+
+
+def _recv_message(sock: socket.socket):
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+
+    # The timeout only applies while waiting for a message, once it started
+    # the whole message is read.
+    sock.settimeout(None)
+    data = _recv_exact(sock, _HEADER.unpack(header)[0])
+    return None if data is None else pickle.loads(data)
+
+
+class _SocketEndpoint:
+    def __init__(self, address: tuple, island: int):
+        self._address = address
+        self._island = island
+        self._socket = None
+
+    def _connect(self):
+        if self._socket is None:
+            self._socket = socket.create_connection(self._address)
+            _send_message(self._socket, self._island)
+
+        return self._socket
+
+    def send(self, island: int, message):
+        _send_message(self._connect(), (island, message))
+
+    def receive(self, timeout: float):
+        sock = self._connect()
+        sock.settimeout(timeout)
+        try:
+            return _recv_message(sock)
+        except socket.timeout:
+            return None
+
+
+class _Relay(threading.Thread):
+    """
+    Forwards the messages of the islands, each island opens a single
+    connection on which it first sends its index. Messages sent to an
+    island that is not connected yet are kept until it connects.
+    """
+
+    def __init__(self, host: str, port: int):
+        super().__init__(daemon=True)
+        self._server = socket.create_server((host, port))
+        self._connections = {}
+        self._pending = collections.defaultdict(list)
+        self._lock = threading.Lock()
+
+    @property
+    def address(self):
+        return self._server.getsockname()[:2]
+
+    def run(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                break
+
+            threading.Thread(
+                target=self._handle, args=(conn,), daemon=True
+            ).start()
+
+    def _handle(self, conn: socket.socket):
+        island = _recv_message(conn)
+        with self._lock:
+            self._connections[island] = conn
+            for message in self._pending.pop(island, []):
+                _send_message(conn, message)
+
+        while True:
+            try:
+                message = _recv_message(conn)
+            except OSError:
+                message = None
+            if message is None:
+                break
+
+            destination, payload = message
+            with self._lock:
+                if destination in self._connections:
+                    _send_message(self._connections[destination], payload)
+                else:
+                    self._pending[destination].append(payload)
+
+        with self._lock:
+            self._connections.pop(island, None)
+        conn.close()
+
+    def close(self):
+        self._server.close()
+        with self._lock:
+            for conn in self._connections.values():
+                conn.close()
+
+
+class SocketTransport:
+    """
+    Migrations through a TCP relay started by the main process, the islands
+    connect to it with `host:port`. The messages are pickled, the relay must
+    only be reachable from trusted machines.
+    """
+
+    def __init__(self, n_islands: int, host: str = "127.0.0.1", port: int = 0):
+        self._relay = _Relay(host, port)
+        self._relay.start()
+
+    @property
+    def address(self):
+        return self._relay.address
+
+    def endpoint(self, island: int):
+        return _SocketEndpoint(self.address, island)
+
+    def close(self):
+        self._relay.close()
+
+
+transports = {
+    "queue": QueueTransport,
+    "socket": SocketTransport,
+}
+
+
+# Islands
+class IslandGeneticAlgorithm(GeneticAlgorithm):
+    """
+    Genetic algorithm evolving one island of an `IslandModel`. Every
+    `migration_interval` generations, the `migration_size` best individuals
+    are sent to the next island of the ring and replace the worst
+    individuals of that island, along with their fitness.
+    """
+
+    def __init__(
+        self,
+        *args,
+        island: int,
+        n_islands: int,
+        endpoint,
+        migration_interval: int,
+        migration_size: int,
+        migration_timeout: float = 600,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._island = island
+        self._n_islands = n_islands
+        self._endpoint = endpoint
+        self._migration_interval = migration_interval
+        self._migration_size = migration_size
+        self._migration_timeout = migration_timeout
+
+    def _on_generation(self, ga_instance):
+        # The migrants are inserted before the checkpoint and the archive
+        # of the generation are written.
+        if self.ga.generations_completed % self._migration_interval == 0:
+            self._migrate()
+
+        super()._on_generation(ga_instance)
+
+    def _migrate(self):
+        population = self.ga.population
+        fitness = self.ga.last_generation_fitness
+        order = np.argsort(fitness)
+        best = order[::-1][: self._migration_size]
+
+        self._endpoint.send(
+            (self._island + 1) % self._n_islands,
+            (
+                self._island,
+                self.ga.generations_completed,
+                population[best].copy(),
+                fitness[best].copy(),
+            ),
+        )
+        message = self._endpoint.receive(self._migration_timeout)
+        if message is None:
+            logger.warning(
+                "Island {}: no migrants received at generation {}",
+                self._island,
+                self.ga.generations_completed,
+            )
+            return
+
+        source, generation, genomes, migrants_fitness = message
+        worst = order[: len(genomes)]
+        population[worst] = genomes
+        fitness[worst] = migrants_fitness
+
+        self._dm.save_log_file(
+            "migrations.csv",
+            ["generation", "source", "sent_generation", "best_migrant"],
+            {
+                "generation": self.ga.generations_completed,
+                "source": source,
+                "sent_generation": generation,
+                "best_migrant": np.max(migrants_fitness),
+            },
+        )
+
+
+def _run_island(island: int, n_islands: int, endpoint, results, kwargs):
+    model = IslandGeneticAlgorithm(
+        island=island, n_islands=n_islands, endpoint=endpoint, **kwargs
+    )
+    model.train()
+    model.save()
+    results.put((island, model.sim_data["best_fitness"]))
+
+
+class IslandModel:
+    """
+    Island model: several populations evolve independently in their own
+    process and regularly exchange their best individuals along a ring.
+
+    Each island saves its run in the `island-<i>` subdirectory of the run
+    directory, the summary of the islands is saved in `islands.dat`. With a
+    seed, every island is seeded with its own stream derived from it.
+
+    transport: queue | socket, or any object with `endpoint(island)` and
+        `close()` methods.
+    """
+
+    _dm_group = GeneticAlgorithm._dm_group
+
+    def __init__(
+        self,
+        config: PygadConfig,
+        env_props: dict,
+        n_islands: int,
+        migration_interval: int = 10,
+        migration_size: int = 2,
+        transport="queue",
+        **kwargs,
+    ):
+        self._dm = DataManager(self._dm_group)
+        self._config = config
+        self._n_islands = n_islands
+        self._kwargs = dict(
+            kwargs,
+            config=config,
+            env_props=env_props,
+            migration_interval=migration_interval,
+            migration_size=migration_size,
+        )
+        if isinstance(transport, str):
+            transport = transports[transport](n_islands)
+        self._transport = transport
+        self._results = {}
+
+    def train(self):
+        context = mp.get_context("spawn")
+        results = context.Queue()
+        processes = []
+        seeds = [None] * self._n_islands
+        if self._config.random_seed is not None:
+            seeds = spawn_seeds(self._config.random_seed, self._n_islands)
+        for island in range(self._n_islands):
+            kwargs = dict(
+                self._kwargs,
+                config=self._config._replace(random_seed=seeds[island]),
+                date=os.path.join(self._dm.date, f"island-{island}"),
+            )
+            process = context.Process(
+                target=_run_island,
+                args=(
+                    island,
+                    self._n_islands,
+                    self._transport.endpoint(island),
+                    results,
+                    kwargs,
+                ),
+            )
+            process.start()
+            processes.append(process)
+
+        try:
+            while len(self._results) < self._n_islands:
+                try:
+                    island, best_fitness = results.get(timeout=1)
+                except queue.Empty:
+                    # An island that died would never send its result
+                    if any(p.exitcode not in (None, 0) for p in processes):
+                        raise RuntimeError("An island stopped unexpectedly")
+                    continue
+
+                self._results[island] = best_fitness
+        except BaseException:
+            # The other islands would wait for the migrations of a stopped
+            # island until the timeout, at each migration.
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join()
+            self._transport.close()
+
+        logger.error("Best fitness per island: {}", self._results)
+
+    def save(self):
+        self._dm.save_local_dat_file(
+            "islands.dat",
+            {
+                "config": self._config,
+                "islands": [
+                    os.path.join(self._dm.date, f"island-{island}")
+                    for island in range(self._n_islands)
+                ],
+                "best_fitness": self._results,
+            },
+        )
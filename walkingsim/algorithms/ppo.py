@@ -1,11 +1,18 @@
 import copy
+import functools
+import os
+
 import gymnasium as gym
 import numpy
 from gymnasium.envs.registration import EnvSpec
 from stable_baselines3 import PPO
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
 
 from walkingsim.utils.baselines_config import BaselinesConfig
 from walkingsim.utils.data_manager import DataManager
+from walkingsim.utils.profiling import PROFILER, ProfileLog
+from walkingsim.utils.run_index import RunIndex
 
 
 class PPO_Algo:
@@ -20,33 +27,61 @@ class PPO_Algo:
         visualize: bool = False,
         timestep: float = 1e-2,
         duration: int = 5,
-        model: PPO = None,
+        model_path: str = None,
+        n_envs: int = None,
+        log_format: str = "csv",
+        seed: int = None,
+        render_interval: int = 1,
+        render_fps: float = None,
     ) -> None:
-        self._dm = DataManager(self._dm_group)
+        self._dm = DataManager(self._dm_group, log_format=log_format)
         self._config = config
         self._env_props = env_props
         self._creature = creature
+        self._fitness = fitness
+        self._seed = seed
+        self._profile = ProfileLog(self._dm, "rollout")
+        self._rollouts = 0
 
         self._spec = EnvSpec(
             "gym_simulation-v0",
             entry_point="walkingsim.simulation.gym:Gym_Simulation",
             max_episode_steps=300,
         )
-        self._env = gym.make(
-            self._spec,
-            max_episode_steps=300,
-            env_props=env_props,
-            creature=creature,
-            visualize=visualize,
-            fitness=fitness,
-            timestep=timestep,
-            duration=duration,
+        # Each environment is created in its own process when training on
+        # multiple environments, a single environment is always used when
+        # rendering.
+        if visualize:
+            n_envs = 1
+        elif n_envs is None:
+            n_envs = config.n_envs
+        self._env = make_vec_env(
+            functools.partial(
+                gym.make,
+                self._spec,
+                max_episode_steps=300,
+                env_props=env_props,
+                creature=creature,
+                visualize=visualize,
+                fitness=fitness,
+                timestep=timestep,
+                duration=duration,
+                render_interval=render_interval,
+                render_fps=render_fps,
+            ),
+            n_envs=n_envs,
+            seed=seed,
+            vec_env_cls=SubprocVecEnv if n_envs > 1 else DummyVecEnv,
+            vec_env_kwargs={"start_method": "spawn"} if n_envs > 1 else None,
         )
-        if model is None:
-            self._model = PPO("MultiInputPolicy", self._env, verbose=1)
+        if model_path is None:
+            self._model = PPO(
+                "MultiInputPolicy", self._env, verbose=1, seed=seed
+            )
         else:
-            self._model = model
-            self._model.set_env(self._env)
+            # Unlike `set_env`, loading with the env supports a number of
+            # environments different from the one used while training.
+            self._model = PPO.load(model_path, env=self._env)
 
     # save & load
     def save(self):
@@ -56,44 +91,139 @@ class PPO_Algo:
                 "config": self._config,
                 "props": self._env_props,
                 "creature": self._creature,
+                "fitness": self._fitness,
+                "seed": self._seed,
             },
         )
         self._model.save(self._dm.get_local_path("model"))
+        self._profile.save()
+        self._dm.close()
+
+        # The score of the run is the mean reward of the last episodes
+        episodes = self._model.ep_info_buffer
+        RunIndex(self._dm_group).add(
+            self._dm.date,
+            creature=self._creature,
+            env=self._env_props,
+            fitness=self._fitness,
+            best_fitness=numpy.mean([episode["r"] for episode in episodes])
+            if episodes
+            else None,
+            config=self._config,
+            seed=self._seed,
+            files=sorted(os.listdir(self._dm.get_local_path(""))),
+        )
 
     @classmethod
-    def load(cls, date: str, visualize: bool = False, timestep: float = 1e-2):
+    def load(
+        cls,
+        date: str,
+        visualize: bool = False,
+        timestep: float = 1e-2,
+        n_envs: int = None,
+    ):
+        """
+        Loads a saved model, the date can also be `last`. Older runs are
+        only found by their date. The model is attached to `n_envs`
+        environments, as many as while training by default.
+        """
+        date = RunIndex(cls._dm_group).resolve(date)
         dm = DataManager(cls._dm_group, date, fail_if_exists=False)
         params = dm.load_local_dat_file("params.dat")
-        model = PPO.load(dm.get_local_path("model"))
         return PPO_Algo(
             config=params["config"],
             env_props=params["props"],
             creature=params["creature"],
+            fitness=params.get("fitness", "walking-v0"),
             visualize=visualize,
             timestep=timestep,
-            model=model,
+            model_path=dm.get_local_path("model"),
+            n_envs=n_envs,
+            seed=params.get("seed"),
         )
 
     # train & visualize
     def callback(self, *args):
-        fitness = args[0]['rewards'][0]
+        # The rewards and observations of all the environments are averaged
+        fitness = numpy.mean(args[0]["rewards"])
         fitness_props = {
-            key: value[0][0]
-            for key, value in args[0]['new_obs'].items()
+            key: numpy.mean(value) for key, value in args[0]["new_obs"].items()
         }
 
         # Add entry in csv log
-        headers = ["total_fitness"] + list(
-            fitness_props.keys()
-        )
-        data = copy.copy(fitness_props)
-        data["total_fitness"] = fitness
-        self._dm.save_log_file("results.csv", headers, data)
+        with PROFILER.phase("ppo.log"):
+            headers = ["total_fitness"] + list(fitness_props.keys())
+            data = copy.copy(fitness_props)
+            data["total_fitness"] = fitness
+            self._dm.save_log_file("results.csv", headers, data)
+
+        # The profile is aggregated at the last step of each rollout
+        if (
+            PROFILER.enabled
+            and args[0]["n_steps"] == args[0]["n_rollout_steps"] - 1
+        ):
+            self._record_profile()
+
+    def _record_profile(self):
+        if isinstance(self._env, SubprocVecEnv):
+            for samples in self._env.env_method("pop_profile_samples"):
+                PROFILER.merge(samples)
+
+        self._profile.record(self._rollouts)
+        self._rollouts += 1
 
     def train(self):
-        self._model.learn(
-            self._config.timesteps, progress_bar=self._config.show_progress, callback=self.callback
+        try:
+            self._model.learn(
+                self._config.timesteps,
+                progress_bar=self._config.show_progress,
+                callback=self.callback,
+            )
+        finally:
+            self._dm.flush_logs()
+
+    def record(
+        self,
+        output: str,
+        fps: float = 30,
+        format: str = "auto",
+        timestep: float = 1e-2,
+        duration: float = 5,
+    ):
+        """
+        Replays the policy once in a standalone simulation, without any
+        window loop, and records it, see `ChronoRecorder`. Returns the path
+        of the recording.
+        """
+        from walkingsim.envs.chrono.recorder import ChronoRecorder
+        from walkingsim.simulation.gym import Gym_Simulation
+
+        simulation = Gym_Simulation(
+            self._env_props,
+            self._creature,
+            fitness=self._fitness,
+            timestep=timestep,
+            duration=duration,
+            record_trajectory=True,
+        )
+        # The episodes are limited the same way as while training
+        env = gym.wrappers.TimeLimit(
+            simulation, max_episode_steps=self._spec.max_episode_steps
         )
+        obs, _ = env.reset(seed=self._seed)
+        recorder = ChronoRecorder(simulation.environment, output, fps, format)
+        recorder.capture()
+
+        terminated = truncated = False
+        while not (terminated or truncated):
+            action, _state = self._model.predict(obs, deterministic=True)
+            action = numpy.clip(action, -1, 1)
+            obs, _, terminated, truncated, _ = env.step(action)
+            recorder.capture()
+
+        output = recorder.close(simulation.trajectory)
+        env.close()
+        return output
 
     def visualize(self):
         vec_env = self._model.get_env()
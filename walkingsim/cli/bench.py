@@ -0,0 +1,160 @@
+import json
+import platform
+import sys
+import time
+
+
+def _bench_env_steps(env_props, creature, timestep, actions):
+    from walkingsim.envs.chrono import ChronoEnvironment
+
+    env = ChronoEnvironment(creature=creature)
+    env.reset(env_props)
+
+    start = time.perf_counter()
+    for action in actions:
+        env.step(action, timestep)
+    elapsed = time.perf_counter() - start
+
+    env.close()
+    return len(actions) / elapsed
+
+
+def _bench_resets(env_props, creature, timestep, actions, nb_resets):
+    from walkingsim.envs.chrono import ChronoEnvironment
+
+    env = ChronoEnvironment(creature=creature)
+    env.reset(env_props)
+
+    # Only the resets are measured, a step is done before each reset so that
+    # the state of the scene actually has to be restored.
+    elapsed = 0
+    for i in range(nb_resets):
+        env.step(actions[i % len(actions)], timestep)
+        start = time.perf_counter()
+        env.reset(env_props)
+        elapsed += time.perf_counter() - start
+
+    env.close()
+    return nb_resets / elapsed
+
+
+def _bench_ga_rollouts(env_props, creature, timestep, duration, genome, n):
+    from walkingsim.simulation.ga import GA_Simulation
+
+    simulation = GA_Simulation(
+        env_props, creature, timestep=timestep, duration=duration
+    )
+
+    start = time.perf_counter()
+    for _ in range(n):
+        simulation.simulate(genome)
+    elapsed = time.perf_counter() - start
+
+    simulation.close()
+    return n / elapsed
+
+
+def _bench_ppo_steps(env_props, creature, timestep, duration, actions):
+    try:
+        from walkingsim.simulation.gym import Gym_Simulation
+    except ImportError:
+        return None
+
+    simulation = Gym_Simulation(
+        env_props, creature, timestep=timestep, duration=duration
+    )
+    simulation.reset(seed=0)
+
+    start = time.perf_counter()
+    for action in actions:
+        _, _, terminated, truncated, _ = simulation.step(action)
+        if terminated or truncated:
+            simulation.reset()
+    elapsed = time.perf_counter() - start
+
+    simulation.close()
+    return len(actions) / elapsed
+
+
+def bench(
+    *,
+    envs: dict,
+    creatures: list,
+    timesteps: list,
+    steps: int = 1000,
+    resets: int = 100,
+    rollouts: int = 5,
+    duration: float = 5,
+    cycle_timesteps: int = 500,
+    seed: int = 0,
+    output: str = None,
+):
+    """
+    Measures the throughput of the simulation for each combination of
+    creature, environment and timestep, and writes the results as JSON.
+
+    The actions are drawn from a seeded generator so that every run
+    simulates exactly the same thing, nothing is rendered.
+    """
+    import numpy as np
+
+    from walkingsim.envs.chrono import ChronoEnvironment
+
+    results = []
+    for creature in creatures:
+        shape = ChronoEnvironment(creature=creature).creature_shape
+        rng = np.random.default_rng(seed)
+        actions = rng.uniform(-1, 1, (steps, shape))
+        genome = rng.uniform(-1, 1, (cycle_timesteps, shape))
+
+        for env_name, env_props in envs.items():
+            for timestep in timesteps:
+                results.append(
+                    {
+                        "creature": creature,
+                        "environment": env_name,
+                        "timestep": timestep,
+                        "env_steps_per_s": _bench_env_steps(
+                            env_props, creature, timestep, actions * 1000
+                        ),
+                        "resets_per_s": _bench_resets(
+                            env_props,
+                            creature,
+                            timestep,
+                            actions * 1000,
+                            resets,
+                        ),
+                        "ga_rollouts_per_s": _bench_ga_rollouts(
+                            env_props,
+                            creature,
+                            timestep,
+                            duration,
+                            genome,
+                            rollouts,
+                        ),
+                        "ppo_env_steps_per_s": _bench_ppo_steps(
+                            env_props, creature, timestep, duration, actions
+                        ),
+                    }
+                )
+                print(json.dumps(results[-1]), file=sys.stderr, flush=True)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "steps": steps,
+            "resets": resets,
+            "rollouts": rollouts,
+            "duration": duration,
+            "cycle_timesteps": cycle_timesteps,
+        },
+        "results": results,
+    }
+
+    if output is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(output, "w") as fp:
+            json.dump(report, fp, indent=2)
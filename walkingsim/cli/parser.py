@@ -1,27 +1,38 @@
 from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser, Namespace
 
-from walkingsim.cli.train import train_ga, train_ppo
-from walkingsim.cli.vis import visualize_ga, visualize_ppo
-from walkingsim.fitness import fitnesses
-from walkingsim.loader import EnvironmentProps
+from walkingsim import registry
 
 
+# NOTE: The commands are imported by their handler only, so that `--help`
+# and the light commands never import numpy, pychrono or torch.
 class WalkingSimArgumentParser:
     def __init__(self):
         self.parser = ArgumentParser(
             prog="walkingsim", formatter_class=ArgumentDefaultsHelpFormatter
         )
         self.ns = Namespace()
-        self.available_algorithms = ["ga", "ppo"]
-        self.available_fitnesses = list(fitnesses.keys())
-        self.env_loader = EnvironmentProps("./environments")
+        self.available_algorithms = list(registry.algorithms)
+        self.available_fitnesses = list(registry.fitnesses)
+        self.available_creatures = list(registry.creatures)
+        self._env_loader = None
 
         self.commands = self.parser.add_subparsers(
             title="Command", required=True
         )
         self.setup_train_parser()
         self.setup_vis_parser()
+        self.setup_record_parser()
         self.setup_env_parser()
+        self.setup_bench_parser()
+
+    @property
+    def env_loader(self):
+        if self._env_loader is None:
+            from walkingsim.loader import EnvironmentProps
+
+            self._env_loader = EnvironmentProps("./environments")
+
+        return self._env_loader
 
     # Setup Parser
     def setup_train_parser(self):
@@ -80,6 +91,26 @@ class WalkingSimArgumentParser:
             type=int,
             help="The maximum duration of a single simulation",
         )
+        general_options.add_argument(
+            "--log-format",
+            dest="log_format",
+            default="csv",
+            choices=["csv", "columnar"],
+            help="The format of the log files",
+        )
+        general_options.add_argument(
+            "--profile",
+            action="store_true",
+            dest="profile",
+            help="Profile the phases of the simulation, the statistics are saved with the run data",
+        )
+        general_options.add_argument(
+            "--seed",
+            dest="seed",
+            type=int,
+            default=None,
+            help="Seed of the training, runs with the same seed and options give the same results",
+        )
         render_group = general_options.add_mutually_exclusive_group()
         render_group.add_argument(
             "--render",
@@ -93,6 +124,20 @@ class WalkingSimArgumentParser:
             dest="render",
             help="Do not render while training",
         )
+        general_options.add_argument(
+            "--render-interval",
+            dest="render_interval",
+            type=int,
+            default=1,
+            help="Number of physics steps between two renders",
+        )
+        general_options.add_argument(
+            "--render-fps",
+            dest="render_fps",
+            type=float,
+            default=None,
+            help="Maximum number of renders per second, the physics runs at full speed in between",
+        )
 
         # Genetic Algorithm Options
         ga_algo_options = train_parser.add_argument_group(
@@ -117,6 +162,148 @@ class WalkingSimArgumentParser:
             default=500,
             help="Number of timesteps per cycle",
         )
+        ga_algo_options.add_argument(
+            "--quantize",
+            action="store_true",
+            dest="quantize",
+            help="Store the genomes as int8 indices of the gene space",
+        )
+        ga_algo_options.add_argument(
+            "--encoding",
+            dest="encoding",
+            default="raw",
+            choices=["raw", "fourier"],
+            help="Genome encoding, the forces of every timestep or the coefficients of a periodic gait",
+        )
+        ga_algo_options.add_argument(
+            "--harmonics",
+            dest="harmonics",
+            type=int,
+            default=2,
+            help="Number of harmonics per joint of the fourier encoding",
+        )
+        ga_algo_options.add_argument(
+            "--max-periods",
+            dest="max_periods",
+            type=int,
+            default=4,
+            help="Maximum number of gait periods per cycle of the fourier encoding",
+        )
+        ga_algo_options.add_argument(
+            "--islands",
+            dest="islands",
+            type=int,
+            default=1,
+            help="Number of populations evolving in their own process",
+        )
+        ga_algo_options.add_argument(
+            "--migration-interval",
+            dest="migration_interval",
+            type=int,
+            default=10,
+            help="Number of generations between two migrations of the islands",
+        )
+        ga_algo_options.add_argument(
+            "--migration-size",
+            dest="migration_size",
+            type=int,
+            default=2,
+            help="Number of individuals migrating to the next island",
+        )
+        ga_algo_options.add_argument(
+            "--transport",
+            dest="transport",
+            default="queue",
+            choices=["queue", "socket"],
+            help="How the islands exchange their individuals",
+        )
+        ga_algo_options.add_argument(
+            "--workers",
+            dest="workers",
+            type=int,
+            default=1,
+            help="Number of worker processes used to evaluate the population",
+        )
+        ga_algo_options.add_argument(
+            "--cache-size",
+            dest="cache_size",
+            type=int,
+            default=4096,
+            help="Number of fitness values kept in cache (0 to disable)",
+        )
+        ga_algo_options.add_argument(
+            "--persist-cache",
+            action="store_true",
+            dest="persist_cache",
+            help="Save the fitness cache in the run directory, it is only reused when the run is resumed with --resume",
+        )
+        ga_algo_options.add_argument(
+            "--checkpoint-interval",
+            dest="checkpoint_interval",
+            type=int,
+            default=1,
+            help="Number of generations between two checkpoints (0 to disable)",
+        )
+        ga_algo_options.add_argument(
+            "--save-solutions",
+            action="store_true",
+            dest="save_solutions",
+            help="Archive the population of every generation in solutions.npy",
+        )
+        ga_algo_options.add_argument(
+            "--resume",
+            dest="resume",
+            metavar="DATE",
+            help="Resume a run from its last checkpoint, the other training options are ignored",
+        )
+        ga_algo_options.add_argument(
+            "--coarse-timestep",
+            dest="coarse_timestep",
+            type=float,
+            default=None,
+            help="Screen the individuals at this timestep and only simulate the best ones at --timestep",
+        )
+        ga_algo_options.add_argument(
+            "--coarse-duration",
+            dest="coarse_duration",
+            type=float,
+            default=None,
+            help="Duration of the screening simulations (defaults to --duration)",
+        )
+        ga_algo_options.add_argument(
+            "--promote-fraction",
+            dest="promote_fraction",
+            type=float,
+            default=0.25,
+            help="Fraction of the screened individuals simulated at --timestep",
+        )
+        ga_algo_options.add_argument(
+            "--prune",
+            action="store_true",
+            dest="prune",
+            help="Stop the simulations that cannot reach the top of the population",
+        )
+        ga_algo_options.add_argument(
+            "--prune-checkpoints",
+            dest="prune_checkpoints",
+            type=int,
+            default=4,
+            help="Number of checkpoints at which a simulation can be pruned",
+        )
+        ga_algo_options.add_argument(
+            "--prune-top-k",
+            dest="prune_top_k",
+            type=int,
+            default=None,
+            help="Rank an individual must be able to reach to not be pruned (defaults to the elitism)",
+        )
+        ga_algo_options.add_argument(
+            "--prune-max-speed",
+            dest="prune_max_speed",
+            type=float,
+            default=2.0,
+            help="Maximum speed (m/s) assumed when bounding the fitness",
+        )
 
         # RL Algorithm Options
         rl_algo_options = train_parser.add_argument_group(
@@ -128,6 +315,13 @@ class WalkingSimArgumentParser:
             type=int,
             help="Number of timesteps",
         )
+        rl_algo_options.add_argument(
+            "--n-envs",
+            dest="n_envs",
+            type=int,
+            default=1,
+            help="Number of environments, each one running in its own process",
+        )
 
     def setup_vis_parser(self):
         vis_parser = self.commands.add_parser(
@@ -139,7 +333,9 @@ class WalkingSimArgumentParser:
         vis_parser.set_defaults(command="visualize")
 
         vis_parser.add_argument(
-            "date", nargs="?", help="The date of when the model was trained"
+            "date",
+            nargs="?",
+            help="The date of when the model was trained, `last` or `best` (default: last)",
         )
 
         # General Options
@@ -168,6 +364,61 @@ class WalkingSimArgumentParser:
             help=" Amount of seconds to wait when simulation is done",
         )
 
+    def setup_record_parser(self):
+        record_parser = self.commands.add_parser(
+            "record",
+            help="Record trained models without any window loop",
+            aliases=["r"],
+            formatter_class=ArgumentDefaultsHelpFormatter,
+        )
+        record_parser.set_defaults(command="record")
+
+        record_parser.add_argument(
+            "dates",
+            nargs="*",
+            help="The dates of when the models were trained, `last` or `best` (default: last)",
+        )
+
+        # General Options
+        general_options = record_parser.add_argument_group("General Options")
+        general_options.add_argument(
+            "--algorithm",
+            "-a",
+            dest="algorithm",
+            default="ga",
+            choices=self.available_algorithms,
+            help="The algorithm to record",
+        )
+        general_options.add_argument(
+            "--timestep",
+            dest="timestep",
+            default=1e-2,
+            type=float,
+            help="The duration of a timestep",
+        )
+        general_options.add_argument(
+            "--output-dir",
+            "-o",
+            dest="output_dir",
+            default="recordings",
+            help="Directory in which the recordings are written",
+        )
+        general_options.add_argument(
+            "--fps",
+            dest="fps",
+            default=30,
+            type=float,
+            help="Number of frames per second of simulation time",
+        )
+        general_options.add_argument(
+            "--format",
+            "-f",
+            dest="format",
+            default="auto",
+            choices=["auto", "mp4", "png", "poses"],
+            help="Format of the recordings, poses exports the trajectory of the bodies without rendering",
+        )
+
     def setup_env_parser(self):
         env_parser = self.commands.add_parser(
             "env",
@@ -184,13 +435,129 @@ class WalkingSimArgumentParser:
             "list", help="List all the available environments", aliases=["l"]
         )
 
+    def setup_bench_parser(self):
+        bench_parser = self.commands.add_parser(
+            "bench",
+            help="Benchmark the simulation throughput",
+            aliases=["b"],
+            formatter_class=ArgumentDefaultsHelpFormatter,
+        )
+        bench_parser.set_defaults(command="bench")
+
+        bench_parser.add_argument(
+            "--creatures",
+            dest="creatures",
+            nargs="+",
+            default=self.available_creatures,
+            choices=self.available_creatures,
+            help="Creatures to benchmark",
+        )
+        bench_parser.add_argument(
+            "--environments",
+            dest="environments",
+            nargs="+",
+            default=["default", "moon", "mars"],
+            help="Environments to benchmark",
+        )
+        bench_parser.add_argument(
+            "--timesteps",
+            dest="timesteps",
+            nargs="+",
+            type=float,
+            default=[1e-2, 5e-3, 1e-3],
+            help="Timesteps to benchmark",
+        )
+        bench_parser.add_argument(
+            "--steps",
+            dest="steps",
+            type=int,
+            default=1000,
+            help="Number of steps measured for the raw & PPO steps",
+        )
+        bench_parser.add_argument(
+            "--resets",
+            dest="resets",
+            type=int,
+            default=100,
+            help="Number of resets measured",
+        )
+        bench_parser.add_argument(
+            "--rollouts",
+            dest="rollouts",
+            type=int,
+            default=5,
+            help="Number of GA rollouts measured",
+        )
+        bench_parser.add_argument(
+            "--duration",
+            "-d",
+            dest="duration",
+            type=float,
+            default=5,
+            help="The duration of a GA rollout",
+        )
+        bench_parser.add_argument(
+            "--seed",
+            dest="seed",
+            type=int,
+            default=0,
+            help="Seed of the generated actions",
+        )
+        bench_parser.add_argument(
+            "--output",
+            "-o",
+            dest="output",
+            help="JSON file in which the results are written (default: stdout)",
+        )
+
     # Handle Commands
     def handle_train(self):
-        if self.ns.algorithm == "ga":
+        from walkingsim.cli.train import resume_ga, train_ga, train_ppo
+
+        if self.ns.render_interval < 1:
+            self.parser.error("--render-interval must be at least 1")
+        if self.ns.render_fps is not None and self.ns.render_fps <= 0:
+            self.parser.error("--render-fps must be positive")
+
+        if self.ns.algorithm == "ga" and self.ns.resume is not None:
+            resume_ga(
+                date=self.ns.resume,
+                visualize=self.ns.render,
+                profile=self.ns.profile,
+            )
+        elif self.ns.algorithm == "ga":
             if self.ns.generations is None or self.ns.population is None:
                 self.parser.error(
                     "When using GA algorithm, you must pass --generations and --population"
                 )
+            if self.ns.workers < 1:
+                self.parser.error("--workers must be at least 1")
+            if self.ns.checkpoint_interval < 0:
+                self.parser.error("--checkpoint-interval cannot be negative")
+            if self.ns.coarse_timestep is not None and (
+                self.ns.coarse_timestep < self.ns.timestep
+            ):
+                self.parser.error(
+                    "--coarse-timestep cannot be smaller than --timestep"
+                )
+            if self.ns.coarse_duration is not None and (
+                self.ns.coarse_duration <= 0
+            ):
+                self.parser.error("--coarse-duration must be positive")
+            if not 0 < self.ns.promote_fraction <= 1:
+                self.parser.error("--promote-fraction must be in ]0, 1]")
+            if self.ns.harmonics < 1 or self.ns.max_periods < 1:
+                self.parser.error(
+                    "--harmonics and --max-periods must be at least 1"
+                )
+            if self.ns.islands < 1 or self.ns.migration_interval < 1:
+                self.parser.error(
+                    "--islands and --migration-interval must be at least 1"
+                )
+            if not 0 < self.ns.migration_size <= self.ns.population:
+                self.parser.error(
+                    "--migration-size must be between 1 and the population size"
+                )
 
             train_ga(
                 creature=self.ns.creature,
@@ -201,12 +568,39 @@ class WalkingSimArgumentParser:
                 timesteps=self.ns.cycle_timesteps,
                 population_size=self.ns.population,
                 num_generations=self.ns.generations,
+                workers=self.ns.workers,
+                cache_size=self.ns.cache_size,
+                persist_cache=self.ns.persist_cache,
+                quantize=self.ns.quantize,
+                encoding=self.ns.encoding,
+                harmonics=self.ns.harmonics,
+                max_periods=self.ns.max_periods,
+                checkpoint_interval=self.ns.checkpoint_interval,
+                save_solutions=self.ns.save_solutions,
+                islands=self.ns.islands,
+                migration_interval=self.ns.migration_interval,
+                migration_size=self.ns.migration_size,
+                transport=self.ns.transport,
+                coarse_timestep=self.ns.coarse_timestep,
+                coarse_duration=self.ns.coarse_duration,
+                promote_fraction=self.ns.promote_fraction,
+                prune=self.ns.prune,
+                prune_checkpoints=self.ns.prune_checkpoints,
+                prune_top_k=self.ns.prune_top_k,
+                prune_max_speed=self.ns.prune_max_speed,
+                log_format=self.ns.log_format,
+                profile=self.ns.profile,
+                render_interval=self.ns.render_interval,
+                render_fps=self.ns.render_fps,
+                seed=self.ns.seed,
             )
         elif self.ns.algorithm == "ppo":
             if self.ns.timesteps is None:
                 self.parser.error(
                     "When using any RL algorithms, you must pass --timesteps"
                 )
+            if self.ns.n_envs < 1:
+                self.parser.error("--n-envs must be at least 1")
 
             train_ppo(
                 creature=self.ns.creature,
@@ -215,9 +609,17 @@ class WalkingSimArgumentParser:
                 duration=self.ns.duration,
                 timestep=self.ns.timestep,
                 timesteps=self.ns.timesteps,
+                n_envs=self.ns.n_envs,
+                log_format=self.ns.log_format,
+                profile=self.ns.profile,
+                render_interval=self.ns.render_interval,
+                render_fps=self.ns.render_fps,
+                seed=self.ns.seed,
             )
 
     def handle_visualize(self):
+        from walkingsim.cli.vis import visualize_ga, visualize_ppo
+
         if self.ns.algorithm == "ga":
             visualize_ga(
                 date=self.ns.date,
@@ -237,9 +639,54 @@ class WalkingSimArgumentParser:
             for env, description in envs.items():
                 print(f"{env}: {description}")
 
+    def handle_record(self):
+        from walkingsim.cli.vis import record_ga, record_ppo
+
+        if self.ns.fps <= 0:
+            self.parser.error("--fps must be positive")
+
+        kwargs = {
+            "dates": self.ns.dates,
+            "output_dir": self.ns.output_dir,
+            "fps": self.ns.fps,
+            "format": self.ns.format,
+            "timestep": self.ns.timestep,
+        }
+        if self.ns.algorithm == "ga":
+            record_ga(**kwargs)
+        elif self.ns.algorithm == "ppo":
+            record_ppo(**kwargs)
+
+    def handle_bench(self):
+        from walkingsim.cli.bench import bench
+
+        envs = {}
+        for environment in self.ns.environments:
+            try:
+                envs[environment] = self.env_loader.load(environment)
+            except FileNotFoundError:
+                self.parser.error(f"Invalid environment '{environment}'")
+
+        bench(
+            envs=envs,
+            creatures=self.ns.creatures,
+            timesteps=self.ns.timesteps,
+            steps=self.ns.steps,
+            resets=self.ns.resets,
+            rollouts=self.ns.rollouts,
+            duration=self.ns.duration,
+            seed=self.ns.seed,
+            output=self.ns.output,
+        )
+
     # Run
     def run(self):
         self.parser.parse_args(namespace=self.ns)
+
+        # Logging is only configured once a command runs, the spawned
+        # workers inherit its level through the environment.
+        import walkingsim.utils._logging  # noqa: F401
+
         if self.ns.command == "train":
             try:
                 self.ns.env = self.env_loader.load(self.ns.environment)
@@ -251,5 +698,9 @@ class WalkingSimArgumentParser:
             self.handle_train()
         elif self.ns.command == "visualize":
             self.handle_visualize()
+        elif self.ns.command == "record":
+            self.handle_record()
         elif self.ns.command == "env":
             self.handle_env()
+        elif self.ns.command == "bench":
+            self.handle_bench()
@@ -8,10 +8,42 @@ def train_ga(
     timesteps: int = 500,
     population_size: int,
     num_generations: int,
+    workers: int = 1,
+    cache_size: int = 4096,
+    persist_cache: bool = False,
+    quantize: bool = False,
+    encoding: str = "raw",
+    harmonics: int = 2,
+    max_periods: int = 4,
+    checkpoint_interval: int = 1,
+    save_solutions: bool = False,
+    coarse_timestep: float = None,
+    coarse_duration: float = None,
+    promote_fraction: float = 0.25,
+    prune: bool = False,
+    prune_checkpoints: int = 4,
+    prune_top_k: int = None,
+    prune_max_speed: float = 2.0,
+    log_format: str = "csv",
+    profile: bool = False,
+    render_interval: int = 1,
+    render_fps: float = None,
+    seed: int = None,
+    islands: int = 1,
+    migration_interval: int = 10,
+    migration_size: int = 2,
+    transport: str = "queue",
 ):
+    from loguru import logger
+
     from walkingsim.algorithms.ga import GeneticAlgorithm
+    from walkingsim.algorithms.island import IslandModel
+    from walkingsim.utils.profiling import PROFILER
     from walkingsim.utils.pygad_config import PygadConfig
 
+    if profile:
+        PROFILER.enable()
+
     config = PygadConfig(
         num_generations=num_generations,
         num_parents_mating=4,  # TODO: Add argument
@@ -24,22 +56,70 @@ def train_ga(
         initial_population=None,  # TODO: Add argument
         population_size=population_size,
         num_joints=8,  # FIXME: Load this from the creature
-        save_solutions=False,
+        save_solutions=save_solutions,
         gene_space={"low": -1, "high": 1, "step": 0.1},
         init_range_low=-1,
         init_range_high=1,
         random_mutation_min_val=-1,
         random_mutation_max_val=1,
         timesteps=timesteps,
+        quantize=quantize,
+        encoding=encoding,
+        harmonics=harmonics,
+        max_periods=max_periods,
+        checkpoint_interval=checkpoint_interval,
+        workers=workers,
+        cache_size=cache_size,
+        persist_cache=persist_cache,
+        coarse_timestep=coarse_timestep,
+        coarse_duration=coarse_duration,
+        promote_fraction=promote_fraction,
+        prune=prune,
+        prune_checkpoints=prune_checkpoints,
+        prune_top_k=prune_top_k,
+        prune_max_speed=prune_max_speed,
+        random_seed=seed,
     )
-    model = GeneticAlgorithm(
-        config=config,
-        env_props=env,
-        creature=creature,
-        visualize=visualize,
-        duration=duration,
-        timestep=timestep,
-    )
+    if islands > 1:
+        if visualize:
+            logger.warning("Rendering is disabled in the islands")
+
+        model = IslandModel(
+            config=config,
+            env_props=env,
+            n_islands=islands,
+            migration_interval=migration_interval,
+            migration_size=migration_size,
+            transport=transport,
+            creature=creature,
+            duration=duration,
+            timestep=timestep,
+            log_format=log_format,
+        )
+    else:
+        model = GeneticAlgorithm(
+            config=config,
+            env_props=env,
+            creature=creature,
+            visualize=visualize,
+            duration=duration,
+            timestep=timestep,
+            log_format=log_format,
+            render_interval=render_interval,
+            render_fps=render_fps,
+        )
+    model.train()
+    model.save()
+
+
+def resume_ga(*, date: str, visualize: bool = False, profile: bool = False):
+    from walkingsim.algorithms.ga import GeneticAlgorithm
+    from walkingsim.utils.profiling import PROFILER
+
+    if profile:
+        PROFILER.enable()
+
+    model = GeneticAlgorithm.resume(date, visualize=visualize)
     model.train()
     model.save()
 
@@ -52,11 +132,23 @@ def train_ppo(
     duration: int = 5,
     timestep: float = 1e-2,
     timesteps: int,
+    n_envs: int = 1,
+    log_format: str = "csv",
+    profile: bool = False,
+    render_interval: int = 1,
+    render_fps: float = None,
+    seed: int = None,
 ):
     from walkingsim.algorithms.ppo import PPO_Algo
     from walkingsim.utils.baselines_config import BaselinesConfig
+    from walkingsim.utils.profiling import PROFILER
 
-    config = BaselinesConfig(timesteps=timesteps, show_progress=True)
+    if profile:
+        PROFILER.enable()
+
+    config = BaselinesConfig(
+        timesteps=timesteps, show_progress=True, n_envs=n_envs
+    )
     model = PPO_Algo(
         config=config,
         env_props=env,
@@ -64,6 +156,10 @@ def train_ppo(
         visualize=visualize,
         duration=duration,
         timestep=timestep,
+        log_format=log_format,
+        render_interval=render_interval,
+        render_fps=render_fps,
+        seed=seed,
     )
     model.train()
     model.save()
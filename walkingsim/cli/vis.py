@@ -7,8 +7,55 @@ def visualize_ga(*, date: str = None, timestep: float = 1e-2, delay: int = 0):
     model.visualize()
 
 
-def visualize_ppo(*, date: str, timestep: float = 1e-2, delay: int = 0):
+def visualize_ppo(*, date: str = None, timestep: float = 1e-2, delay: int = 0):
     from walkingsim.algorithms.ppo import PPO_Algo
 
     model = PPO_Algo.load(date=date, visualize=True, timestep=timestep)
     model.visualize()
+
+
+def record_ga(
+    *,
+    dates: list,
+    output_dir: str,
+    fps: float = 30,
+    format: str = "auto",
+    timestep: float = 1e-2,
+):
+    import os
+
+    from walkingsim.algorithms.ga import GeneticAlgorithm
+
+    os.makedirs(output_dir, exist_ok=True)
+    for date in dates or [None]:
+        model = GeneticAlgorithm.load(date=date, timestep=timestep)
+        model.record(
+            os.path.join(output_dir, f"ga-{date or 'last'}.mp4"),
+            fps=fps,
+            format=format,
+        )
+
+
+def record_ppo(
+    *,
+    dates: list,
+    output_dir: str,
+    fps: float = 30,
+    format: str = "auto",
+    timestep: float = 1e-2,
+):
+    import os
+
+    from walkingsim.algorithms.ppo import PPO_Algo
+
+    os.makedirs(output_dir, exist_ok=True)
+    for date in dates or [None]:
+        # The policy is replayed in its own simulation, a single
+        # environment is enough for the model.
+        model = PPO_Algo.load(date=date, timestep=timestep, n_envs=1)
+        model.record(
+            os.path.join(output_dir, f"ppo-{date or 'last'}.mp4"),
+            fps=fps,
+            format=format,
+            timestep=timestep,
+        )
@@ -12,6 +12,8 @@ Description:
 
 import typing as t
 
+import numpy as np
+
 
 class _CreatureBody:
     def __init__(
@@ -63,6 +65,11 @@ class _CreatureBody:
     def motor(self):
         return self._motor
 
+    @property
+    def limits(self) -> t.Optional[t.Tuple[float, float]]:
+        """The (min, max) angle limits of the link, if any"""
+        return None
+
     # Methods
     def collision(
         self,
@@ -95,6 +102,10 @@ class Creature:
         bodies: retrieve a list of all the bodies in the creature
         links: retrieve a list of all the links in the creature
         motors: retrieve a list of all the motors in the creature
+
+    The lists of bodies, links and motors of the whole creature are built
+    once, when the creature is created. The lists returned for the whole
+    creature are shared and must not be modified.
     """
 
     _CREATURE_HEIGHT = -1
@@ -110,17 +121,52 @@ class Creature:
             root_size, family=1, position=root_pos, parent=None
         )
         self.create()
+        self._build_topology()
 
     def create(self):
         raise NotImplementedError
 
+    def _build_topology(self):
+        """Flattens the tree of bodies, once the creature is created"""
+        self.__bodies = []
+        self.__links = []
+        self.__motors = []
+        limits = []
+
+        def _walk(body: _CreatureBody):
+            self.__bodies.append(body.body)
+            if body.link is not None:
+                self.__links.append(body.link)
+                limits.append(body.limits or (-np.inf, np.inf))
+            if body.motor is not None:
+                self.__motors.append(body.motor)
+
+            for child in body.childs:
+                _walk(child)
+
+        _walk(self.root)
+
+        limits = np.array(limits, dtype=np.float64).reshape((-1, 2))
+        self.__links_min = limits[:, 0]
+        self.__links_max = limits[:, 1]
+
     @property
     def root(self):
         return self.__root
 
+    @property
+    def links_min(self) -> np.ndarray:
+        """Minimum angle of each link, in the same order as `links()`"""
+        return self.__links_min
+
+    @property
+    def links_max(self) -> np.ndarray:
+        """Maximum angle of each link, in the same order as `links()`"""
+        return self.__links_max
+
     def bodies(self, root=None):
         if root is None:
-            root = self.root
+            return self.__bodies
 
         _bodies = [root.body]
         for child in root.childs:
@@ -129,7 +175,7 @@ class Creature:
 
     def links(self, root=None):
         if root is None:
-            root = self.root
+            return self.__links
 
         _links = []
         if root.link is not None:
@@ -141,7 +187,7 @@ class Creature:
 
     def motors(self, root=None):
         if root is None:
-            root = self.root
+            return self.__motors
 
         _motors = []
         if root.motor is not None:
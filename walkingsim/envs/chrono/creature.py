@@ -33,6 +33,14 @@ class ChronoCreatureBody(_CreatureBody):
             self._TEXTURE, scale_x=5, scale_y=5
         )
 
+    @property
+    def limits(self):
+        if self._link is None:
+            return None
+
+        limit = self._link.GetLimit_Rz()
+        return (limit.GetMin(), limit.GetMax())
+
     # Methods
     def collision(
         self,
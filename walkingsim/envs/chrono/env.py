@@ -1,5 +1,6 @@
 import math
 
+import numpy as np
 import pychrono as chrono
 
 from walkingsim.creature.bipede import Bipede
@@ -8,19 +9,17 @@ from walkingsim.creature.godzilla import Godzilla
 from walkingsim.envs.chrono.creature import ChronoCreatureBody
 from walkingsim.envs.chrono.utils import _tuple_to_chrono_vector
 from walkingsim.envs.chrono.visualizer import ChronoVisualizer
-
-
-class ChCustomTorqueFunction(chrono.ChFunction_SetpointCallback):
-    def __init__(self, value: float):
-        super().__init__()
-        self.__value = value
-
-    def SetpointCallback(self, t: float):
-        return self.__value
+from walkingsim.utils.observations import ObservationBuffer
+from walkingsim.utils.profiling import PROFILER
 
 
 class ChronoEnvironment:
-    def __init__(self, visualize: bool = False, creature: str = "quadrupede"):
+    def __init__(
+        self,
+        visualize: bool = False,
+        creature: str = "quadrupede",
+        capacity: int = 1024,
+    ):
         self.__environment = chrono.ChSystemNSC()
         if creature == "quadrupede":
             self.__creature_cls = Quadrupede
@@ -34,22 +33,38 @@ class ChronoEnvironment:
         self.__visualize = visualize
         self.__visualizer = None
         self.__properties = None
+        self.__motor_funcs = []
 
         # Materials & Colors
         self.__ground_material = chrono.ChMaterialSurfaceNSC()
         self.__ground_color = chrono.ChColor(0.5, 0.7, 0.3)
 
-        # Observations
-        self.__observations = []
+        # Observations, once the capacity is reached the oldest observations
+        # are overwritten (except the first one)
+        self.__observations = ObservationBuffer(
+            capacity, self.__creature_cls._CREATURE_MOTORS
+        )
 
     @property
     def observations(self):
         return self.__observations
 
+    @property
+    def system(self):
+        return self.__environment
+
+    @property
+    def creature(self):
+        return self.__creature
+
     @property
     def creature_shape(self):
         return self.__creature_cls._CREATURE_MOTORS
 
+    @property
+    def properties(self):
+        return self.__properties
+
     @property
     def time(self):
         return self.__environment.GetChTime()
@@ -62,11 +77,47 @@ class ChronoEnvironment:
         return False
 
     def reset(self, properties: dict):
+        # NOTE: The scene is always built again, restoring the bodies of a
+        # previous scene doesn't reset the contact manifolds nor the
+        # rotation accumulated by the motors, the episodes would depend on
+        # the previous ones.
+        self._build(properties)
+        self.__observations.clear()
+        self._gather_observations()
+
+    def step(self, action, timestep: float):
+        """The action is an array or a list of the forces of the motors"""
+        with PROFILER.phase("env.apply_forces"):
+            if isinstance(action, np.ndarray):
+                action = action.tolist()
+            self._apply_forces(action)
+        with PROFILER.phase("env.dynamics"):
+            self.__environment.DoStepDynamics(timestep)
+        with PROFILER.phase("env.observations"):
+            self._gather_observations()
+
+    def render(self):
+        if self.__visualize and self.__visualizer is None:
+            self.__visualizer = ChronoVisualizer(
+                self.__environment, self.__properties
+            )
+            self.__visualizer.setup()
+
+        if self.__visualizer is not None:
+            self.__visualizer.render()
+            self.__visualizer.check()
+
+    def close(self):
+        if self.__visualizer is not None:
+            self.__visualizer.close()
+
+    # private methods
+    def _build(self, properties: dict):
+        """Builds the whole scene (ground & creature) from scratch"""
         self.__properties = properties
 
         self.__environment.Clear()
         self.__environment.SetChTime(0)  # NOTE: Is this necessary ?
-        self.__observations.clear()
 
         # Set environment properties
         gravity = properties.get("gravity", (0, -9.81, 0))
@@ -108,62 +159,44 @@ class ChronoEnvironment:
         for link in self.__creature.links():
             self.__environment.AddLink(link)
 
-        self._gather_observations()
+        # Each motor keeps the same function for the whole lifetime of the
+        # scene, only its value is updated at each step.
+        # NOTE: Important to store the functions otherwise they are destroyed
+        # when this method is terminated, so chrono cannot access them anymore
+        self.__motor_funcs = []
+        for motor in self.__creature.motors():
+            func = chrono.ChFunction_Const(0)
+            if isinstance(motor, chrono.ChLinkMotorRotationTorque):
+                motor.SetTorqueFunction(func)
+            elif isinstance(motor, chrono.ChLinkMotorRotationAngle):
+                motor.SetAngleFunction(func)
+            self.__motor_funcs.append(func)
+
         if self.__visualizer:
             self.__visualizer.refresh()
 
-    def step(self, action, timestep: float):
-        self._apply_forces(action.tolist())
-        self.__environment.DoStepDynamics(timestep)
-        self._gather_observations()
-
-    def render(self):
-        if self.__visualize and self.__visualizer is None:
-            self.__visualizer = ChronoVisualizer(
-                self.__environment, self.__properties
-            )
-            self.__visualizer.setup()
-
-        if self.__visualizer is not None:
-            self.__visualizer.render()
-            self.__visualizer.check()
-
-    def close(self):
-        if self.__visualizer is not None:
-            self.__visualizer.close()
-
-    # private methods
     def _apply_forces(self, action: list):
-        if len(action) < len(self.__creature.motors()):
+        if len(action) < len(self.__motor_funcs):
             raise RuntimeError("Forces for joints are not enough")
 
-        # NOTE: Important to store the function otherwise they are destroyed
-        # when function is terminated, so chrono cannot access them anymore
-        self.__joints_funcs = []
-
-        for i, joint in enumerate(self.__creature.motors()):
-            self.__joints_funcs.append(ChCustomTorqueFunction(action[i]))
-            if isinstance(joint, chrono.ChLinkMotorRotationTorque):
-                joint.SetTorqueFunction(self.__joints_funcs[i])
-            elif isinstance(joint, chrono.ChLinkMotorRotationAngle):
-                joint.SetAngleFunction(self.__joints_funcs[i])
+        for func, value in zip(self.__motor_funcs, action):
+            func.Set_yconst(value)
 
     def _get_nb_joints_at_limit(self):
         """
         Returns the nb of joints that are closer to their limit angles
         """
-        nb_joints_at_limit = 0
-        for link in self.__creature.links():
-            max_angle = link.GetLimit_Rz().GetMax()
-            min_angle = link.GetLimit_Rz().GetMin()
-            current_angle = link.GetRelAngle()
-            treshold = 0.99
-            if current_angle >= (treshold * max_angle) or current_angle <= (
-                treshold * min_angle
-            ):
-                nb_joints_at_limit += 1
-
-        return nb_joints_at_limit
+        links = self.__creature.links()
+        angles = np.fromiter(
+            (link.GetRelAngle() for link in links),
+            dtype=np.float64,
+            count=len(links),
+        )
+        treshold = 0.99
+        at_limit = (angles >= treshold * self.__creature.links_max) | (
+            angles <= treshold * self.__creature.links_min
+        )
+        return int(np.count_nonzero(at_limit))
 
     def _gather_observations(self):
         nb_joints_at_limit = self._get_nb_joints_at_limit()
@@ -185,31 +218,23 @@ class ChronoEnvironment:
 
         # Get position and rotation of trunk
         trunk_pos = self.__creature.root.body.GetPos()
-        self.__observations.append(
-            {
-                "position": (trunk_pos.x, trunk_pos.y, trunk_pos.z),
-                "link_rotations": {},
-            }
-        )
-        for i, motor in enumerate(self.__creature.motors()):
-            rot = motor.GetMotorRot()
-            self.__observations[-1]["link_rotations"].update({str(i): rot})
+        position = (trunk_pos.x, trunk_pos.y, trunk_pos.z)
+        link_rotations = [
+            motor.GetMotorRot() for motor in self.__creature.motors()
+        ]
 
         # Distance calculation
         step_distance = 0
-        if len(self.__observations) > 1:
-
+        if len(self.__observations) > 0:
             step_distance = (
-                self.__observations[-1]["position"][0]
-                - self.__observations[0]["position"][0]
+                position[0] - self.__observations.first["position"][0]
             )
 
-        # We update the last sensor data added with those additional information
-        self.__observations[-1].update(
-            {
-                "distance": step_distance,
-                "joints_at_limits": nb_joints_at_limit,
-                "trunk_hit_ground": trunk_hit_ground,
-                "legs_hit_ground": legs_hit_ground,
-            }
+        self.__observations.append(
+            position,
+            link_rotations,
+            step_distance,
+            nb_joints_at_limit,
+            trunk_hit_ground,
+            legs_hit_ground,
         )
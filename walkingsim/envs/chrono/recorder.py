@@ -0,0 +1,171 @@
+import os
+import shutil
+import subprocess
+import tempfile
+
+import numpy as np
+from loguru import logger
+
+from walkingsim.envs.chrono.env import ChronoEnvironment
+from walkingsim.envs.chrono.visualizer import ChronoVisualizer
+
+
+class ChronoRecorder:
+    """
+    Records a simulation without an interactive loop, a frame is captured
+    each time the simulation time reaches the next frame, every other step
+    is skipped.
+
+    format: auto | mp4 | png | poses
+        - mp4: The frames are encoded with `ffmpeg`, an image sequence is
+            kept when `ffmpeg` is not installed.
+        - png: Image sequence, one file per frame in a directory named
+            after the output.
+        - poses: The position & rotation of every body at each frame are
+            saved in a `.npz` file, nothing is rendered. The observations of
+            every step given to `close` are saved as well.
+        - auto: mp4, or poses when the scene cannot be rendered.
+
+    NOTE: Irrlicht still opens a window to render the frames, run it inside
+    a virtual display (e.g. `xvfb-run`) on machines without a display.
+    """
+
+    def __init__(
+        self,
+        environment: ChronoEnvironment,
+        output: str,
+        fps: float = 30,
+        format: str = "auto",
+        size: tuple = (1024, 768),
+    ) -> None:
+        self.__environment = environment
+        self.__output = output
+        self.__frame_interval = 1 / fps
+        self.__fps = fps
+        self.__next_frame = 0
+        self.__nb_frames = 0
+
+        self.__visualizer = None
+        self.__frames_dir = None
+        self.__poses = []
+        if format != "poses":
+            try:
+                self.__visualizer = ChronoVisualizer(
+                    environment.system, environment.properties, size
+                )
+                self.__visualizer.setup()
+            except Exception as e:
+                if format != "auto":
+                    raise
+                logger.warning(
+                    "Cannot render the scene ({}), recording poses", e
+                )
+                self.__visualizer = None
+                format = "poses"
+            else:
+                format = "mp4" if format == "auto" else format
+
+        self.__format = format
+        if format == "png":
+            self.__frames_dir = os.path.splitext(output)[0]
+            os.makedirs(self.__frames_dir, exist_ok=True)
+        elif format == "mp4":
+            self.__frames_dir = tempfile.mkdtemp(prefix="walkingsim-")
+
+    @property
+    def format(self):
+        return self.__format
+
+    def capture(self):
+        """Captures a frame if the simulation reached the next frame"""
+        time = self.__environment.time
+        if time + 1e-9 < self.__next_frame:
+            return
+
+        self.__next_frame += self.__frame_interval
+        self.__nb_frames += 1
+        if self.__visualizer is not None:
+            self.__visualizer.render()
+            self.__visualizer.capture(
+                os.path.join(
+                    self.__frames_dir, f"frame-{self.__nb_frames:06d}.png"
+                )
+            )
+        else:
+            self.__poses.append((time, self._get_poses()))
+
+    def close(self, trajectory=None):
+        """
+        Writes the recording and returns the path of the file (or directory)
+        that was written.
+
+        :param trajectory: Observations of every step of the simulation
+            (see `ObservationBuffer`), only saved with the poses
+        """
+        if self.__visualizer is not None:
+            self.__visualizer.close()
+
+        if self.__format == "poses":
+            return self._save_poses(trajectory)
+        if self.__format == "mp4":
+            return self._encode()
+
+        return self.__frames_dir
+
+    def _get_poses(self):
+        poses = []
+        for body in self.__environment.system.Get_bodylist():
+            pos, rot = body.GetPos(), body.GetRot()
+            poses.append((pos.x, pos.y, pos.z, rot.e0, rot.e1, rot.e2, rot.e3))
+
+        return poses
+
+    def _save_poses(self, trajectory=None):
+        output = os.path.splitext(self.__output)[0] + ".npz"
+        bodies = self.__environment.system.Get_bodylist()
+        poses = np.array([poses for _, poses in self.__poses])
+        steps = {}
+        if trajectory is not None:
+            steps = {
+                f"steps_{name}": trajectory[name]
+                for name in trajectory.dtype.names
+            }
+        np.savez_compressed(
+            output,
+            fps=self.__fps,
+            time=np.array([time for time, _ in self.__poses]),
+            names=np.array([body.GetName() for body in bodies]),
+            positions=poses[..., :3],
+            rotations=poses[..., 3:],
+            **steps,
+        )
+        logger.info("Saved {} poses in {}", len(self.__poses), output)
+        return output
+
+    def _encode(self):
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            output = os.path.splitext(self.__output)[0]
+            shutil.move(self.__frames_dir, output)
+            logger.warning("ffmpeg not found, frames kept in {}", output)
+            return output
+
+        subprocess.run(
+            [
+                ffmpeg,
+                "-y",
+                "-loglevel",
+                "error",
+                "-framerate",
+                str(self.__fps),
+                "-i",
+                os.path.join(self.__frames_dir, "frame-%06d.png"),
+                "-pix_fmt",
+                "yuv420p",
+                self.__output,
+            ],
+            check=True,
+        )
+        shutil.rmtree(self.__frames_dir)
+        logger.info("Saved {} frames in {}", self.__nb_frames, self.__output)
+        return self.__output
@@ -4,15 +4,19 @@ import pychrono.irrlicht as chronoirr
 
 class ChronoVisualizer:
     def __init__(
-        self, system: chrono.ChSystem, properties: dict = None
+        self,
+        system: chrono.ChSystem,
+        properties: dict = None,
+        size: tuple = (1024, 768),
     ) -> None:
         self.__visualizer = chronoirr.ChVisualSystemIrrlicht()
         self.__system = system
         self.__properties = properties if properties is not None else {}
+        self.__size = size
 
     def setup(self):
         self.__visualizer.AttachSystem(self.__system)
-        self.__visualizer.SetWindowSize(1024, 768)
+        self.__visualizer.SetWindowSize(*self.__size)
         self.__visualizer.SetWindowTitle("3D muscle-based walking sim")
         self.__visualizer.Initialize()
         skybox_texture = self.__properties.get("textures", {}).get(
@@ -32,6 +36,10 @@ class ChronoVisualizer:
         #  self.__visualizer.ShowInfoPanel(True)
         self.__visualizer.EndScene()
 
+    def capture(self, filename: str):
+        """Writes the last rendered frame in an image file"""
+        self.__visualizer.WriteImageToFile(filename)
+
     def refresh(self):
         self.__visualizer.BindAll()
 
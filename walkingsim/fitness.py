@@ -1,13 +1,29 @@
+import math
 import typing as t
 
+import numpy as np
+
+from walkingsim import registry
+
 
 class Fitness:
+    """
+    Streaming fitness, it is computed step by step from the latest
+    observation only.
+
+    Instead of the whole history of observations, the fitness carries the
+    position of the first observation (given to `reset`) and the position
+    of the previous observation.
+    """
+
     def __init__(self, sim_duration: float, timestep: float) -> None:
         self._props = dict.fromkeys(self.props_range.keys(), 0.0)
         self._fitness = 0
         self._done = False
         self._timestep = timestep
         self._duration = sim_duration
+        self._first_position = None
+        self._previous_position = None
 
     @property
     def props(self):
@@ -25,20 +41,61 @@ class Fitness:
     def done(self):
         return self._done
 
-    def reset(self):
+    def reset(self, observation=None):
+        """
+        Resets the fitness, the observation is the initial observation of
+        the simulation.
+        """
         self._props = dict.fromkeys(self.props_range.keys(), 0.0)
         self._fitness = 0
         self._done = False
-
-    def compute(
-        self,
-        last_observation: dict,
-        observations: list,
-        forces: list,
-        time: float,
+        self._first_position = None
+        self._previous_position = None
+        self._forces_sum = None
+        if observation is not None:
+            self._first_position = tuple(observation["position"])
+            self._previous_position = self._first_position
+
+    def update(
+        self, observation, forces: list, time: float, forces_sum: float = None
     ):
+        """
+        Computes the fitness of a step and carries the required state, the
+        sum of the forces is computed when it was not precomputed.
+        """
+        if self._first_position is None:
+            self._first_position = tuple(observation["position"])
+
+        self._forces_sum = forces_sum
+        self.compute(observation, forces, time)
+        self._previous_position = tuple(observation["position"])
+
+    def compute(self, last_observation, forces: list, time: float):
         raise NotImplementedError
 
+    def upper_bound(self, time: float, max_speed: float) -> float:
+        """
+        Optimistic bound of the fitness the simulation can still reach at
+        the end, assuming the creature never falls and that its trunk never
+        moves faster than `max_speed` (in m/s) from now on.
+        """
+        return math.inf
+
+    def _remaining_times(self, time: float):
+        # The simulation stops at the first step after the duration, one
+        # more step than expected may happen because of rounding errors.
+        # The bounds take the best of both cases.
+        nb_steps = max(math.ceil((self._duration - time) / self._timestep), 0)
+        return time + self._timestep * np.arange(1, nb_steps + 2)
+
+    def _remaining_moves(self, time: float, max_speed: float):
+        """Upper bounds of the distance & height at each remaining step"""
+        times = self._remaining_times(time)
+        moves = max_speed * (times - time)
+        distance = self._previous_position[0] - self._first_position[0]
+        height = self._previous_position[1] - self._first_position[1]
+        return times, distance + moves, height + moves
+
 
 class WalkingFitnessV0(Fitness):
     @property
@@ -51,13 +108,7 @@ class WalkingFitnessV0(Fitness):
             "distance": (-1000, 1000),
         }
 
-    def compute(
-        self,
-        last_observation: dict,
-        observations: list,
-        forces: list,
-        time: float,
-    ):
+    def compute(self, last_observation, forces: list, time: float):
         # If the trunk touches the ground, alive_bonus is negative and stops sim
         if (
             not last_observation["trunk_hit_ground"]
@@ -79,16 +130,33 @@ class WalkingFitnessV0(Fitness):
         #  self._props["distance"] += last_observation["distance"]
         self._props["speed"] += last_observation["distance"] / time
         self._props["height_diff"] += 0.1 * (
-            (last_observation["position"][1] - observations[0]["position"][1])
+            (last_observation["position"][1] - self._first_position[1])
         )
         self._props["distance"] += last_observation["distance"] // 2
         #  self._props["walk_straight"] = -3 * (
         #      last_observation["position"][2] ** 2
         #  )
 
-        self._props["forces"] = -0.2 * abs((sum(forces)))
+        if self._forces_sum is None:
+            self._forces_sum = sum(forces)
+        self._props["forces"] = -0.2 * abs(self._forces_sum)
         self._fitness = sum(self._props.values())
 
+    def upper_bound(self, time: float, max_speed: float) -> float:
+        if self._done:
+            return self._fitness
+        if self._previous_position is None:
+            return math.inf
+
+        # The forces penalty is replaced at each step and never positive,
+        # the other properties are sums over the steps.
+        times, distances, heights = self._remaining_moves(time, max_speed)
+        steps = np.cumsum(
+            0.5 + distances / times + 0.1 * heights + distances / 2
+        )
+        current = self._fitness - self._props["forces"]
+        return current + max(steps[-1], steps[-2] if len(steps) > 1 else 0)
+
 
 class WalkingFitnessV1(Fitness):
     @property
@@ -102,18 +170,9 @@ class WalkingFitnessV1(Fitness):
             "walk_straight": (-50, 50),
         }
 
-    def compute(
-        self,
-        last_observation: dict,
-        observations: list,
-        forces: list,
-        time: float,
-    ):
-        if len(observations) >= 2:
-            if (
-                last_observation["position"][0]
-                > observations[-2]["position"][0]
-            ):
+    def compute(self, last_observation, forces: list, time: float):
+        if self._previous_position is not None:
+            if last_observation["position"][0] > self._previous_position[0]:
                 self._props["forward_bonus"] += 0.02
             else:
                 self._props["forward_bonus"] -= 0.05 * (
@@ -132,13 +191,32 @@ class WalkingFitnessV1(Fitness):
         self._props["speed"] = distance / time
         self._props["speed_gap"] = 3 * -abs(target - (distance / time))
         self._props["height_diff"] = -10 * abs(
-            last_observation["position"][1] - observations[0]["position"][1]
+            last_observation["position"][1] - self._first_position[1]
         )
         self._props["walk_straight"] = -abs(last_observation["position"][2])
         self._fitness = sum(self._props.values())
 
+    def upper_bound(self, time: float, max_speed: float) -> float:
+        if self._done:
+            return self._fitness
+        if self._previous_position is None:
+            return math.inf
+
+        # The bonuses are sums over the steps, the speed only depends on the
+        # final distance and the other properties are never positive.
+        times, distances, _ = self._remaining_moves(time, max_speed)
+        nb_steps = len(times)
+        bonuses = (0.02 + self._timestep / 5) * nb_steps
+        return (
+            self._props["forward_bonus"]
+            + self._props["alive_bonus"]
+            + bonuses
+            + np.max(distances[-2:] / times[-2:])
+        )
+
 
+# The names are listed in the registry, so that the command line doesn't
+# import this module
 fitnesses: t.Mapping[str, Fitness] = {
-    "walking-v0": WalkingFitnessV0,
-    "walking-v1": WalkingFitnessV1,
+    name: globals()[cls_name] for name, cls_name in registry.fitnesses.items()
 }
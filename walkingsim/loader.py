@@ -28,14 +28,24 @@ class EnvironmentProps:
     def __init__(self, __datapath: str):
         self.__datapath = __datapath
 
-    def list(self):
-        """List all the available environments"""
-        return {
-            os.path.basename(file): self.load(os.path.splitext(file)[0]).get(
-                "description", None
-            )
+    def names(self):
+        """Names of the available environments, without reading them"""
+        return sorted(
+            os.path.splitext(file)[0]
             for file in os.listdir(self.__datapath)
-        }
+            if file.endswith(".json")
+        )
+
+    def list(self):
+        """List all the available environments and their description"""
+        environments = {}
+        for name in self.names():
+            filename = os.path.join(self.__datapath, f"{name}.json")
+            with open(filename, "r") as fp:
+                description = json.load(fp).get("description", None)
+            environments[f"{name}.json"] = description
+
+        return environments
 
     def load(self, __env: str):
         """
@@ -0,0 +1,16 @@
+"""
+Names of the components that can be selected from the command line.
+
+This module must stay free of heavy imports (numpy, pychrono, ...) since
+the CLI reads it before knowing which command runs. The names of the
+creatures match the ones built by `ChronoEnvironment`.
+"""
+
+algorithms = ("ga", "ppo")
+# Name of each fitness and of its class in `walkingsim.fitness`, which
+# builds `walkingsim.fitness.fitnesses` from it
+fitnesses = {
+    "walking-v0": "WalkingFitnessV0",
+    "walking-v1": "WalkingFitnessV1",
+}
+creatures = ("quadrupede", "bipede", "godzilla")
@@ -1,5 +1,9 @@
+import math
+import time
+
 from walkingsim.envs.chrono import ChronoEnvironment
 from walkingsim.fitness import fitnesses
+from walkingsim.utils.profiling import PROFILER
 
 
 class BaseSimulation:
@@ -13,12 +17,31 @@ class BaseSimulation:
         timestep: float = 1e-2,
         duration: float = 5,
         ending_delay: float = 0,
+        record_trajectory: bool = False,
+        render_interval: int = 1,
+        render_fps: float = None,
     ) -> None:
+        """
+        render_interval: Number of steps between two renders
+        render_fps: Maximum number of renders per second (wall-clock), the
+            physics keeps running at full speed between two frames
+        """
         self._env_props = env_props
+        # The fitness only needs the latest observation, so the history is
+        # only kept when the trajectory is recorded. In that case the
+        # observations of a whole simulation fit in the buffer, the first
+        # and last steps included.
+        capacity = 2
+        if record_trajectory:
+            capacity = math.ceil((duration + ending_delay) / timestep) + 2
         self._environment = ChronoEnvironment(
-            visualize=visualize, creature=creature
+            visualize=visualize, creature=creature, capacity=capacity
         )
         self._render_in_step = visualize
+        self._render_interval = max(render_interval, 1)
+        self._render_period = 1 / render_fps if render_fps else 0
+        self._steps_since_render = 0
+        self._next_render = 0
         self._gain = gain
         self._timestep = timestep
         self._duration = duration
@@ -31,6 +54,10 @@ class BaseSimulation:
             )
         self._fitness = fitness_cls(self._duration, self._timestep)
 
+    @property
+    def environment(self):
+        return self._environment
+
     @property
     def creature_shape(self):
         return self._environment.creature_shape
@@ -43,6 +70,15 @@ class BaseSimulation:
     def reward(self):
         return self._fitness.fitness
 
+    @property
+    def trajectory(self):
+        """Observations of the current simulation, when recorded"""
+        return self._environment.observations.view()
+
+    def pop_profile_samples(self):
+        """Samples profiled in the process running the simulation"""
+        return PROFILER.pop_samples()
+
     def is_closed(self):
         return self._environment.closed
 
@@ -55,17 +91,13 @@ class BaseSimulation:
 
     # Common public methods
     def reset(self, **kwargs):
-        self._environment.reset(self._env_props)
-        self._fitness.reset()
+        with PROFILER.phase("sim.reset"):
+            self._environment.reset(self._env_props)
+            self._fitness.reset(self._environment.observations.last)
         return self._get_observations(), self._get_info()
 
     def step(self, action):
-        self._environment.step(action * self._gain, self._timestep)
-        self._compute_step_reward(action * self._gain)
-
-        if self._render_in_step:
-            self.render()
-
+        self._step_forces(action * self._gain)
         return (
             self._get_observations(),
             self._fitness.fitness,
@@ -81,19 +113,38 @@ class BaseSimulation:
         self._environment.close()
 
     # Common private methods
-    def _compute_step_reward(self, forces):
+    def _step_forces(self, forces, forces_sum: float = None):
+        """Steps with forces already scaled by the gain"""
+        self._environment.step(forces, self._timestep)
+        with PROFILER.phase("sim.fitness"):
+            self._compute_step_reward(forces, forces_sum)
+
+        if self._render_in_step and self._is_render_due():
+            with PROFILER.phase("sim.render"):
+                self.render()
+
+    def _compute_step_reward(self, forces, forces_sum: float = None):
         observations = self._environment.observations
         if len(observations) == 0:
             return 0
 
-        last_observations = observations[-1]
-        self._fitness.compute(
-            last_observations,
-            observations,
-            forces,
-            self._environment.time,
+        self._fitness.update(
+            observations.last, forces, self._environment.time, forces_sum
         )
 
+    def _is_render_due(self):
+        self._steps_since_render += 1
+        if self._steps_since_render < self._render_interval:
+            return False
+
+        now = time.monotonic()
+        if now < self._next_render:
+            return False
+
+        self._steps_since_render = 0
+        self._next_render = now + self._render_period
+        return True
+
     def _is_time_limit_reached(self):
         return self._environment.time > self._duration
 
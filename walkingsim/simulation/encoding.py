@@ -0,0 +1,151 @@
+import numpy as np
+
+
+class GenomeEncoding:
+    """
+    Representation of the genomes handled by pygad.
+
+    By default the genes are the forces themselves (float64). When
+    quantized, each gene is the int8 index of a value of the gene space,
+    the forces are decoded with a table shared by every genome. The
+    genomes are then 8 times smaller in memory, in the saved files and
+    when sent to the workers.
+    """
+
+    name = "raw"
+
+    def __init__(self, gene_space: dict, quantize: bool = False):
+        self._gene_space = gene_space
+        self._quantize = quantize
+        self._table = None
+        if quantize:
+            if gene_space is None or gene_space.get("step") is None:
+                raise ValueError("Only a discrete gene space can be quantized")
+
+            # Same values as the ones sampled by pygad from the gene space
+            self._table = np.arange(
+                gene_space["low"], gene_space["high"], gene_space["step"]
+            )
+            if len(self._table) > np.iinfo(np.int8).max + 1:
+                raise ValueError(
+                    f"The gene space has too many values ({len(self._table)}) to be quantized"
+                )
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.gene_space, config.quantize)
+
+    @property
+    def params(self) -> dict:
+        """Parameters changing the meaning of a genome"""
+        return {"encoding": self.name, "gene_space": self._gene_space}
+
+    @property
+    def gene_space(self):
+        """The gene space given to pygad"""
+        if self._quantize:
+            return {"low": 0, "high": len(self._table), "step": 1}
+
+        return self._gene_space
+
+    @property
+    def gene_type(self):
+        return np.int8 if self._quantize else float
+
+    def num_genes(self, timesteps: int, nb_motors: int) -> int:
+        return timesteps * nb_motors
+
+    def _values(self, genome):
+        genome = np.asarray(genome)
+        if self._quantize:
+            genome = self._table[genome.astype(np.intp)]
+
+        return genome.astype(np.float64)
+
+    def decode(self, genome, timesteps: int, nb_motors: int):
+        """Returns the matrix of forces `(timesteps, nb_motors)` of a genome"""
+        return self._values(genome).reshape((timesteps, nb_motors))
+
+
+class FourierEncoding(GenomeEncoding):
+    """
+    Periodic gait: each joint follows a truncated Fourier series and the
+    genome only holds its coefficients, so its size no longer depends on
+    the number of timesteps of a cycle.
+
+    Genome layout, every gene taking its value in the gene space:
+
+    - the frequency, mapped to 1..`max_periods` gait periods per cycle
+    - the offset of each joint
+    - the cosine coefficients `(harmonics, nb_motors)`
+    - the sine coefficients `(harmonics, nb_motors)`
+
+    The cycle always holds a whole number of periods so that the forces
+    stay continuous when the simulation loops over it. The forces are
+    clipped to the bounds of the gene space.
+    """
+
+    name = "fourier"
+
+    def __init__(
+        self,
+        gene_space: dict,
+        quantize: bool = False,
+        harmonics: int = 2,
+        max_periods: int = 4,
+    ):
+        if gene_space is None or "low" not in gene_space:
+            raise ValueError("The Fourier encoding needs a bounded gene space")
+        if harmonics < 1 or max_periods < 1:
+            raise ValueError("harmonics and max_periods must be at least 1")
+
+        super().__init__(gene_space, quantize)
+        self._harmonics = harmonics
+        self._max_periods = max_periods
+        self._low = gene_space["low"]
+        self._high = gene_space["high"]
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            config.gene_space,
+            config.quantize,
+            config.harmonics,
+            config.max_periods,
+        )
+
+    @property
+    def params(self) -> dict:
+        return dict(
+            super().params,
+            harmonics=self._harmonics,
+            max_periods=self._max_periods,
+        )
+
+    def num_genes(self, timesteps: int, nb_motors: int) -> int:
+        return 1 + nb_motors * (1 + 2 * self._harmonics)
+
+    def _periods(self, frequency: float) -> int:
+        ratio = (frequency - self._low) / (self._high - self._low)
+        ratio = min(max(ratio, 0), 1)
+        return 1 + int(round(ratio * (self._max_periods - 1)))
+
+    def decode(self, genome, timesteps: int, nb_motors: int):
+        values = self._values(genome)
+        coefficients = values[1:].reshape((1 + 2 * self._harmonics, nb_motors))
+        offsets = coefficients[0]
+        cosines = coefficients[1 : 1 + self._harmonics]
+        sines = coefficients[1 + self._harmonics :]
+
+        # Phase of every timestep for every harmonic, (timesteps, harmonics)
+        phase = (2 * np.pi * self._periods(values[0]) / timesteps) * np.outer(
+            np.arange(timesteps), np.arange(1, self._harmonics + 1)
+        )
+        forces = offsets + np.cos(phase) @ cosines + np.sin(phase) @ sines
+        return np.clip(forces, self._low, self._high, out=forces)
+
+
+encodings = {
+    GenomeEncoding.name: GenomeEncoding,
+    FourierEncoding.name: FourierEncoding,
+}
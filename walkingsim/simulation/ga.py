@@ -1,3 +1,7 @@
+import math
+
+import numpy as np
+
 from walkingsim.simulation.base import BaseSimulation
 
 
@@ -11,6 +15,9 @@ class GA_Simulation(BaseSimulation):
         timestep: float = 5e-3,
         duration: float = 10,
         ending_delay: float = 0,
+        record_trajectory: bool = False,
+        render_interval: int = 1,
+        render_fps: float = None,
     ) -> None:
         super().__init__(
             env_props,
@@ -21,9 +28,64 @@ class GA_Simulation(BaseSimulation):
             timestep,
             duration,
             ending_delay,
+            record_trajectory=record_trajectory,
+            render_interval=render_interval,
+            render_fps=render_fps,
         )
 
     @property
     def genome_discrete_intervals(self):
         _timesteps_to_second = 1 / self._timestep
         return int(_timesteps_to_second * self._duration)
+
+    def simulate(
+        self,
+        forces_list,
+        threshold: float = None,
+        checkpoints: int = 4,
+        max_speed: float = 2.0,
+        stride: int = 1,
+    ):
+        """
+        Runs a complete simulation, cycling through the forces until the
+        simulation is over.
+
+        :param forces_list: The forces to apply at each timestep of a cycle,
+            a matrix `(timesteps, nb_motors)` not scaled by the gain yet
+        :param threshold: When given, the simulation is pruned at the first
+            checkpoint where the fitness cannot reach the threshold anymore
+        :param checkpoints: Number of evenly spaced checkpoints
+        :param max_speed: The speed used to bound the fitness
+        :param stride: Only every `stride`-th timestep of the cycle is
+            applied, so that a simulation with a timestep `stride` times
+            longer follows the same forces over time
+        :return: The reward, a copy of the reward properties and whether the
+            simulation was pruned. The reward of a pruned simulation is
+            below the threshold but it is not its final reward.
+        """
+        # The forces of the cycle are scaled and summed once, each step then
+        # only picks its row. The rows are summed sequentially, like the
+        # sum computed at each step, so that the fitness doesn't change.
+        forces_matrix = np.asarray(forces_list, dtype=np.float64)[::stride]
+        rows = (forces_matrix * self._gain).tolist()
+        cycle = [(forces, sum(forces)) for forces in rows]
+
+        self.reset()
+
+        interval = self._duration / (checkpoints + 1)
+        next_checkpoint = interval if threshold is not None else math.inf
+        while not self.is_over():
+            for forces, forces_sum in cycle:
+                if self.is_over():
+                    break
+                self._step_forces(forces, forces_sum)
+
+                time = self._environment.time
+                if time >= next_checkpoint:
+                    next_checkpoint += interval
+                    bound = self._fitness.upper_bound(time, max_speed)
+                    if bound < threshold:
+                        reward = min(self.reward, bound)
+                        return reward, dict(self.reward_props), True
+
+        return self.reward, dict(self.reward_props), False
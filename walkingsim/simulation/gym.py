@@ -16,6 +16,9 @@ class Gym_Simulation(BaseSimulation, gym.Env):
         timestep: float = 1e-2,
         duration: float = 5,
         ending_delay: float = 0,
+        record_trajectory: bool = False,
+        render_interval: int = 1,
+        render_fps: float = None,
     ) -> None:
         BaseSimulation.__init__(
             self,
@@ -27,6 +30,9 @@ class Gym_Simulation(BaseSimulation, gym.Env):
             timestep,
             duration,
             ending_delay,
+            record_trajectory=record_trajectory,
+            render_interval=render_interval,
+            render_fps=render_fps,
         )
         gym.Env.__init__(self)
 
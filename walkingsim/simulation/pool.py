@@ -0,0 +1,95 @@
+import functools
+import multiprocessing as mp
+
+from walkingsim.simulation.encoding import GenomeEncoding
+from walkingsim.simulation.ga import GA_Simulation
+from walkingsim.utils.profiling import PROFILER
+
+# Each worker process owns a single simulation, created once when the worker
+# starts and reused for every genome it receives.
+_simulation: GA_Simulation = None
+_coarse_simulation: GA_Simulation = None
+_timesteps: int = None
+_encoding: GenomeEncoding = None
+
+
+def _init_worker(
+    sim_kwargs: dict,
+    timesteps: int,
+    encoding: GenomeEncoding,
+    coarse_sim_kwargs: dict = None,
+):
+    global _simulation, _coarse_simulation, _timesteps, _encoding
+    _simulation = GA_Simulation(**sim_kwargs)
+    if coarse_sim_kwargs is not None:
+        _coarse_simulation = GA_Simulation(**coarse_sim_kwargs)
+    _timesteps = timesteps
+    _encoding = encoding
+
+
+def _simulate(genome, coarse: bool = False, **kwargs):
+    simulation = _coarse_simulation if coarse else _simulation
+    forces_list = _encoding.decode(
+        genome, _timesteps, simulation.creature_shape
+    )
+    with PROFILER.phase("ga.simulate"):
+        result = simulation.simulate(forces_list, **kwargs)
+
+    # The samples profiled in the worker are sent back with the result
+    return result, PROFILER.pop_samples()
+
+
+class GA_SimulationPool:
+    """
+    Pool of worker processes used to evaluate genomes in parallel.
+
+    Every worker builds its own `GA_Simulation` with the given arguments and
+    keeps it for the whole lifetime of the pool. Genomes are sent to the
+    workers in chunks and the results are returned in the same order.
+    The genomes are sent encoded and decoded by the workers.
+
+    When `coarse_sim_kwargs` is given, the workers also build a second
+    simulation used to screen the genomes at a coarser timestep.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        sim_kwargs: dict,
+        timesteps: int,
+        encoding: GenomeEncoding,
+        coarse_sim_kwargs: dict = None,
+    ):
+        self._workers = workers
+        # NOTE: Use `spawn` on every platform, so that workers never inherit
+        # chrono objects created by the parent process.
+        self._pool = mp.get_context("spawn").Pool(
+            processes=workers,
+            initializer=_init_worker,
+            initargs=(sim_kwargs, timesteps, encoding, coarse_sim_kwargs),
+        )
+
+    @property
+    def workers(self):
+        return self._workers
+
+    def imap(self, genomes: list, coarse: bool = False, **kwargs):
+        """
+        Simulates every genome, yielding `(reward, reward_props, pruned)`
+        tuples in the same order as the genomes. The keyword arguments are
+        given to `GA_Simulation.simulate`, `coarse` selects the screening
+        simulation.
+        """
+        chunksize = max(1, len(genomes) // (self._workers * 4))
+        simulate = functools.partial(_simulate, coarse=coarse, **kwargs)
+        for result, samples in self._pool.imap(simulate, genomes, chunksize):
+            PROFILER.merge(samples)
+            yield result
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+    def terminate(self):
+        self._pool.terminate()
+        self._pool.join()
@@ -4,3 +4,4 @@ from typing import NamedTuple
 class BaselinesConfig(NamedTuple):
     timesteps: int
     show_progress: bool
+    n_envs: int = 1
@@ -1,17 +1,357 @@
+import atexit
 import csv
 import datetime as dt
 import os
 import pickle
 import re
 import sys
+import time
 
+import numpy as np
 from loguru import logger
 
 
+class _LogWriter:
+    """
+    Base class of the log writers, the rows are written in batches, either
+    when enough rows are pending or when the last flush is too old.
+    """
+
+    def __init__(self, headers: list, batch_size: int, flush_interval: float):
+        self._headers = headers
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._rows = []
+        self._last_flush = time.monotonic()
+
+    def write(self, row: dict):
+        self._rows.append(row)
+        if (
+            len(self._rows) >= self._batch_size
+            or time.monotonic() - self._last_flush >= self._flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        if self._rows:
+            self._write_rows(self._rows)
+            self._rows.clear()
+
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+
+    def _write_rows(self, rows: list):
+        raise NotImplementedError
+
+
+class _CSVLogWriter(_LogWriter):
+    """Keeps a CSV log file open and appends the rows to it"""
+
+    def __init__(self, file_path: str, *args):
+        super().__init__(*args)
+        is_empty = (
+            not os.path.exists(file_path) or os.path.getsize(file_path) == 0
+        )
+        self._file = open(file_path, "a", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=self._headers)
+        if is_empty:
+            self._writer.writeheader()
+
+    def flush(self):
+        super().flush()
+        self._file.flush()
+
+    def close(self):
+        super().close()
+        self._file.close()
+
+    def _write_rows(self, rows: list):
+        self._writer.writerows(rows)
+
+
+class _ColumnarLogWriter(_LogWriter):
+    """
+    Columnar log, each column is appended to its own file and an index
+    lists the first row and the range of generations of each batch, so
+    that a range of generations is read without reading whole columns.
+
+    The columns keep the type of their values (bool, int64, float64 or
+    str) and a mask of the missing values. When a value doesn't fit the
+    type of its column, the column is converted to the next type that fits
+    it, in this order.
+    """
+
+    _DTYPES = ("bool", "int64", "float64", "str")
+    _SCHEMA_HEADERS = ["column", "file", "dtype"]
+    _INDEX_HEADERS = ["start", "rows", "first_generation", "last_generation"]
+
+    def __init__(self, dir_path: str, *args):
+        super().__init__(*args)
+        os.makedirs(dir_path, exist_ok=True)
+        self._dir_path = dir_path
+        self._columns = _read_columnar_schema(dir_path) or {}
+        self._nb_rows = sum(
+            int(entry["rows"]) for entry in _read_columnar_index(dir_path)
+        )
+        # The rows of a run stopped during a flush are not in the index,
+        # they are dropped before appending new ones.
+        for column in self._columns.values():
+            _truncate_columnar_column(dir_path, column, self._nb_rows)
+
+        self._files = {}
+        self._index = _CSVLogWriter(
+            os.path.join(dir_path, "index.csv"), self._INDEX_HEADERS, 1, 0
+        )
+
+    def flush(self):
+        super().flush()
+        for files in self._files.values():
+            for fp in files.values():
+                fp.flush()
+
+    def close(self):
+        super().close()
+        for name in list(self._files):
+            self._close_column(name)
+        self._index.close()
+
+    def _write_rows(self, rows: list):
+        for name in dict.fromkeys([*self._columns, *self._headers]):
+            values = [row.get(name) for row in rows]
+            dtype = max(
+                (_value_dtype(value) for value in values if value is not None),
+                key=self._DTYPES.index,
+                default="bool",
+            )
+            column = self._columns.get(name)
+            if column is None:
+                self._add_column(name, dtype)
+            elif self._DTYPES.index(dtype) > self._DTYPES.index(
+                column["dtype"]
+            ):
+                self._convert_column(name, dtype)
+            self._append(name, values)
+
+        # The index is only written once the rows of every column are
+        # written, it never lists rows that are not complete.
+        for files in self._files.values():
+            for fp in files.values():
+                fp.flush()
+
+        generations = [
+            row["generation"]
+            for row in rows
+            if row.get("generation") is not None
+        ]
+        self._index.write(
+            {
+                "start": self._nb_rows,
+                "rows": len(rows),
+                "first_generation": min(generations, default=""),
+                "last_generation": max(generations, default=""),
+            }
+        )
+        self._nb_rows += len(rows)
+
+    def _write_schema(self):
+        with open(
+            os.path.join(self._dir_path, "columns.csv"), "w", newline=""
+        ) as fp:
+            writer = csv.DictWriter(fp, fieldnames=self._SCHEMA_HEADERS)
+            writer.writeheader()
+            writer.writerows(
+                {"column": name, **column}
+                for name, column in self._columns.items()
+            )
+
+    def _add_column(self, name: str, dtype: str):
+        self._columns[name] = {
+            "file": f"column-{len(self._columns):03d}",
+            "dtype": dtype,
+        }
+        self._write_schema()
+        # The rows written before the column existed are missing
+        self._append(name, [None] * self._nb_rows)
+
+    def _convert_column(self, name: str, dtype: str):
+        column = self._columns[name]
+        self._close_column(name)
+        values = _read_columnar_column(
+            self._dir_path, column, 0, self._nb_rows
+        ).tolist()
+        for path in _columnar_column_paths(self._dir_path, column).values():
+            if os.path.exists(path):
+                os.remove(path)
+
+        column["dtype"] = dtype
+        self._write_schema()
+        self._append(name, values)
+
+    def _open_column(self, name: str):
+        files = self._files.get(name)
+        if files is None:
+            paths = _columnar_column_paths(self._dir_path, self._columns[name])
+            files = {key: open(path, "ab") for key, path in paths.items()}
+            self._files[name] = files
+
+        return files
+
+    def _close_column(self, name: str):
+        for fp in self._files.pop(name, {}).values():
+            fp.close()
+
+    def _append(self, name: str, values: list):
+        dtype = self._columns[name]["dtype"]
+        files = self._open_column(name)
+        files["mask"].write(
+            np.array([value is None for value in values]).tobytes()
+        )
+        if dtype == "str":
+            data = [
+                b"" if value is None else str(value).encode()
+                for value in values
+            ]
+            # The offsets are the end of each value in the data file
+            ends = files["data"].tell() + np.cumsum(
+                [len(value) for value in data], dtype=np.int64
+            )
+            files["offsets"].write(ends.tobytes())
+            files["data"].write(b"".join(data))
+        else:
+            missing = np.nan if dtype == "float64" else 0
+            files["data"].write(
+                np.array(
+                    [missing if value is None else value for value in values],
+                    dtype=dtype,
+                ).tobytes()
+            )
+
+
+def _value_dtype(value):
+    if isinstance(value, (bool, np.bool_)):
+        return "bool"
+    if isinstance(value, (int, np.integer)):
+        return "int64"
+    if isinstance(value, (float, np.floating)):
+        return "float64"
+    return "str"
+
+
+def _columnar_column_paths(dir_path: str, column: dict):
+    path = os.path.join(dir_path, column["file"])
+    paths = {"data": f"{path}.bin", "mask": f"{path}.mask"}
+    if column["dtype"] == "str":
+        paths["offsets"] = f"{path}.off"
+
+    return paths
+
+
+def _read_columnar_schema(dir_path: str):
+    schema_path = os.path.join(dir_path, "columns.csv")
+    if not os.path.exists(schema_path):
+        return None
+
+    with open(schema_path, "r", newline="") as fp:
+        return {
+            row["column"]: {"file": row["file"], "dtype": row["dtype"]}
+            for row in csv.DictReader(fp)
+        }
+
+
+def _read_columnar_index(dir_path: str):
+    index_path = os.path.join(dir_path, "index.csv")
+    if not os.path.exists(index_path):
+        return []
+
+    with open(index_path, "r", newline="") as fp:
+        return list(csv.DictReader(fp))
+
+
+def _read_columnar_column(dir_path: str, column: dict, start: int, stop: int):
+    """
+    Reads the rows `[start, stop)` of a column, as a masked array when some
+    of them are missing.
+    """
+    paths = _columnar_column_paths(dir_path, column)
+    count = stop - start
+    if count <= 0:
+        return np.array([], dtype=column["dtype"])
+
+    mask = np.fromfile(
+        paths["mask"], dtype=np.bool_, count=count, offset=start
+    )
+    if column["dtype"] == "str":
+        ends = np.fromfile(
+            paths["offsets"], dtype=np.int64, count=count, offset=start * 8
+        )
+        first = _read_columnar_offset(paths["offsets"], start)
+        with open(paths["data"], "rb") as fp:
+            fp.seek(first)
+            raw = fp.read(ends[-1] - first)
+        bounds = [0, *(ends - first).tolist()]
+        data = np.array(
+            [raw[a:b].decode() for a, b in zip(bounds[:-1], bounds[1:])],
+            dtype=str,
+        )
+    else:
+        dtype = np.dtype(column["dtype"])
+        data = np.fromfile(
+            paths["data"],
+            dtype=dtype,
+            count=count,
+            offset=start * dtype.itemsize,
+        )
+
+    if mask.any():
+        return np.ma.masked_array(data, mask)
+
+    return data
+
+
+def _read_columnar_offset(path: str, rows: int) -> int:
+    """Offset of the end of the first `rows` values of a str column"""
+    if rows == 0:
+        return 0
+
+    return int(
+        np.fromfile(path, dtype=np.int64, count=1, offset=(rows - 1) * 8)[0]
+    )
+
+
+def _truncate_columnar_column(dir_path: str, column: dict, rows: int):
+    paths = _columnar_column_paths(dir_path, column)
+    if not all(os.path.exists(path) for path in paths.values()):
+        return
+
+    sizes = {"mask": rows}
+    if column["dtype"] == "str":
+        sizes["offsets"] = rows * 8
+        sizes["data"] = _read_columnar_offset(paths["offsets"], rows)
+    else:
+        sizes["data"] = rows * np.dtype(column["dtype"]).itemsize
+
+    for key, size in sizes.items():
+        if os.path.getsize(paths[key]) > size:
+            os.truncate(paths[key], size)
+
+
 class DataManager:
     def __init__(
-        self, group: str, date: str = None, fail_if_exists: bool = True
+        self,
+        group: str,
+        date: str = None,
+        fail_if_exists: bool = True,
+        log_batch_size: int = 256,
+        log_flush_interval: float = 5.0,
+        log_format: str = "csv",
     ):
+        """
+        log_format: csv | columnar, the format of the log files. A columnar
+            log is a directory with one file per column that can be exported
+            to CSV with `export_log_file`.
+        """
         if date is None:
             date = dt.datetime.now().strftime("%Y%m%d-%H%M%S")
 
@@ -21,6 +361,12 @@ class DataManager:
         self.__data_dir = os.path.join(self.__root_dir, date)
         self.__log_dir = os.path.join(self.__data_dir, "logs")
 
+        self.__log_batch_size = log_batch_size
+        self.__log_flush_interval = log_flush_interval
+        self.__log_writers = {}
+        self.__log_format = log_format
+        self.__atexit_registered = False
+
     @property
     def date(self):
         return self.__date
@@ -46,6 +392,9 @@ class DataManager:
         self._create_data_dir()
 
     # path
+    def _get_columnar_log_dir(self, filename: str):
+        return os.path.join(self.__log_dir, os.path.splitext(filename)[0])
+
     def get_local_path(self, filename: str):
         return os.path.join(self.__data_dir, filename)
 
@@ -58,31 +407,87 @@ class DataManager:
         filepath = self.get_local_path(filename)
         with open(filepath, "wb") as fp:
             pickle.dump(obj, fp)
-            logger.info(f"Saved {obj} in {filepath}")
+            logger.info("Saved {} in {}", type(obj).__name__, filepath)
 
     def save_global_dat_file(self, filename: str, obj):
         self._ensure_data_dir()
         filepath = self.get_global_path(filename)
         with open(filepath, "wb") as fp:
             pickle.dump(obj, fp)
-            logger.info(f"Saved {obj} in {filepath}")
+            logger.info("Saved {} in {}", type(obj).__name__, filepath)
 
-    def save_log_file(self, filename: str, headers, data):
+    def save_local_checkpoint(self, filename: str, obj):
+        """
+        Atomically replaces a .dat file in the run directory, an interrupted
+        save never leaves a partially written checkpoint behind.
+        """
+        self._ensure_data_dir()
+        filepath = self.get_local_path(filename)
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, "wb") as fp:
+            pickle.dump(obj, fp)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp_path, filepath)
+        logger.debug("Saved checkpoint in {}", filepath)
+
+    def create_local_memmap(self, filename: str, shape: tuple, dtype):
+        """
+        Creates a `.npy` file in the run directory and returns it as a
+        writable memory-mapped array.
+        """
         self._ensure_data_dir()
-        file_path = os.path.join(self.__log_dir, filename)
-        with open(file_path, "a", newline="") as csvfile:
-            fieldnames = headers
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            if os.path.getsize(file_path) == 0:
-                writer.writeheader()
-            writer.writerow(data)
+        filepath = self.get_local_path(filename)
+        array = np.lib.format.open_memmap(
+            filepath, mode="w+", dtype=dtype, shape=shape
+        )
+        logger.info("Created {} {} in {}", shape, np.dtype(dtype), filepath)
+        return array
+
+    def save_log_file(self, filename: str, headers, data):
+        """
+        Appends a row to a CSV log file. The file is kept open and the rows
+        are written in batches, `flush_logs` or `close` must be called to
+        make sure every row is written.
+        """
+        writer = self.__log_writers.get(filename)
+        if writer is None:
+            self._ensure_data_dir()
+            args = (headers, self.__log_batch_size, self.__log_flush_interval)
+            if self.__log_format == "columnar":
+                writer = _ColumnarLogWriter(
+                    self._get_columnar_log_dir(filename), *args
+                )
+            else:
+                writer = _CSVLogWriter(
+                    os.path.join(self.__log_dir, filename), *args
+                )
+            self.__log_writers[filename] = writer
+
+            # Pending rows are still written if the program is stopped
+            # without closing the data manager.
+            if not self.__atexit_registered:
+                atexit.register(self.close)
+                self.__atexit_registered = True
+
+        writer.write(data)
+
+    def flush_logs(self):
+        for writer in self.__log_writers.values():
+            writer.flush()
+
+    def close(self):
+        """Writes the pending rows and closes every log file"""
+        for writer in self.__log_writers.values():
+            writer.close()
+        self.__log_writers.clear()
 
     # load
     def load_local_dat_file(self, filename: str):
         filepath = self.get_local_path(filename)
         with open(filepath, "rb") as fp:
             obj = pickle.load(fp)
-            logger.info(f"Loaded {obj} in {filepath}")
+            logger.info("Loaded {} from {}", type(obj).__name__, filepath)
 
         return obj
 
@@ -90,6 +495,136 @@ class DataManager:
         filepath = self.get_global_path(filename)
         with open(filepath, "rb") as fp:
             obj = pickle.load(fp)
-            logger.info(f"Loaded {obj} in {filepath}")
+            logger.info("Loaded {} from {}", type(obj).__name__, filepath)
 
         return obj
+
+    def load_local_checkpoint(self, filename: str):
+        filepath = self.get_local_path(filename)
+        with open(filepath, "rb") as fp:
+            obj = pickle.load(fp)
+            logger.info("Loaded checkpoint from {}", filepath)
+
+        return obj
+
+    def load_local_memmap(self, filename: str, mode: str = "r"):
+        """Opens a `.npy` file of the run directory as a memmap"""
+        return np.load(self.get_local_path(filename), mmap_mode=mode)
+
+    def load_log_file(
+        self,
+        filename: str,
+        columns: list = None,
+        generations: tuple = None,
+    ):
+        """
+        Loads a log file as a dict of column arrays.
+
+        :param filename: The name of the log file (e.g. `results.csv`)
+        :param columns: The columns to load, all of them by default
+        :param generations: The inclusive range `(first, last)` of generations
+            to load, it requires a `generation` column
+        :return: A dict mapping each column to a NumPy array, a masked array
+            for the columns of a columnar log with missing values
+
+        Columnar logs only read the columns and the generations that are
+        asked, CSV logs are parsed completely.
+        """
+        dir_path = self._get_columnar_log_dir(filename)
+        if os.path.exists(dir_path):
+            return self._load_columnar_log(dir_path, columns, generations)
+
+        return self._load_csv_log(
+            os.path.join(self.__log_dir, filename), columns, generations
+        )
+
+    def _load_columnar_log(self, dir_path: str, columns, generations):
+        schema = _read_columnar_schema(dir_path)
+        if schema is None:
+            return {name: np.array([]) for name in columns or []}
+
+        names = list(schema) if columns is None else columns
+        if generations is not None:
+            names = list(dict.fromkeys([*names, "generation"]))
+
+        # Only the batches of rows in the range of generations are read
+        spans = []
+        for entry in _read_columnar_index(dir_path):
+            if generations is not None and entry["first_generation"] != "":
+                first, last = generations
+                if (
+                    float(entry["last_generation"]) < first
+                    or float(entry["first_generation"]) > last
+                ):
+                    continue
+
+            start = int(entry["start"])
+            stop = start + int(entry["rows"])
+            if spans and spans[-1][1] == start:
+                spans[-1][1] = stop
+            else:
+                spans.append([start, stop])
+
+        data = {}
+        for name in names:
+            parts = [
+                _read_columnar_column(dir_path, schema[name], start, stop)
+                for start, stop in spans
+            ]
+            if len(parts) == 0:
+                data[name] = np.array([], dtype=schema[name]["dtype"])
+            elif any(np.ma.isMaskedArray(part) for part in parts):
+                data[name] = np.ma.concatenate(parts)
+            else:
+                data[name] = np.concatenate(parts)
+
+        return self._select_generations(data, columns, generations)
+
+    def _load_csv_log(self, file_path: str, columns, generations):
+        with open(file_path, "r", newline="") as fp:
+            reader = csv.DictReader(fp)
+            names = reader.fieldnames if columns is None else columns
+            if generations is not None:
+                names = list(dict.fromkeys([*names, "generation"]))
+            rows = [[row[name] for name in names] for row in reader]
+
+        data = {}
+        for i, name in enumerate(names):
+            column = np.array([row[i] for row in rows])
+            try:
+                column = column.astype(np.float64)
+            except ValueError:
+                pass
+            data[name] = column
+
+        return self._select_generations(data, columns, generations)
+
+    @staticmethod
+    def _select_generations(data: dict, columns, generations):
+        if generations is not None:
+            first, last = generations
+            generation = data["generation"].astype(np.float64)
+            mask = (generation >= first) & (generation <= last)
+            data = {name: column[mask] for name, column in data.items()}
+            if columns is not None and "generation" not in columns:
+                del data["generation"]
+
+        return data
+
+    def export_log_file(self, filename: str):
+        """
+        Exports a columnar log file to a CSV file with the same name in the
+        log directory.
+        """
+        self.flush_logs()
+        data = self._load_columnar_log(
+            self._get_columnar_log_dir(filename), None, None
+        )
+        with open(
+            os.path.join(self.__log_dir, filename), "w", newline=""
+        ) as fp:
+            writer = csv.writer(fp)
+            writer.writerow(data.keys())
+            writer.writerows(
+                zip(*(column.tolist() for column in data.values()))
+            )
@@ -0,0 +1,119 @@
+import collections
+import hashlib
+import json
+
+import numpy as np
+from loguru import logger
+
+from walkingsim.utils.data_manager import DataManager
+
+
+class FitnessCache:
+    """
+    Bounded LRU cache of the fitness of already simulated genomes.
+
+    Entries are keyed by a hash of the genome bytes and of the context of the
+    simulation (creature, environment, fitness, timestep, ...), so that a
+    cache can never be reused with a different simulation. Each entry holds
+    the total fitness and the reward properties of the genome.
+
+    A cache with a size of 0 is disabled, it never stores anything.
+    """
+
+    _filename = "fitness_cache.dat"
+
+    def __init__(self, maxsize: int, context: dict):
+        self._maxsize = maxsize
+        self._context = hashlib.blake2b(
+            json.dumps(context, sort_keys=True, default=str).encode(),
+            digest_size=16,
+        )
+        self._entries = collections.OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+        # Counters of the whole run, never reset
+        self._total_hits = 0
+        self._total_misses = 0
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, genome) -> bytes:
+        genome = np.ascontiguousarray(genome)
+        _hash = self._context.copy()
+        _hash.update(genome.dtype.str.encode())
+        _hash.update(genome.tobytes())
+        return _hash.digest()
+
+    def get(self, key: bytes):
+        """
+        Returns the `(fitness, reward_props)` stored for the key, or None if
+        the genome was never simulated.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            self._total_misses += 1
+            return None
+
+        self._hits += 1
+        self._total_hits += 1
+        self._entries.move_to_end(key)
+        return entry[0], dict(entry[1])
+
+    def put(self, key: bytes, fitness: float, props: dict):
+        if self._maxsize <= 0:
+            return
+
+        self._entries[key] = (fitness, dict(props))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def pop_counters(self):
+        """Returns the hits and misses since the last call and resets them"""
+        counters = (self._hits, self._misses)
+        self._hits, self._misses = 0, 0
+        return counters
+
+    # save & load
+    def save(self, dm: DataManager):
+        # Saved atomically, the cache is also saved with each checkpoint
+        dm.save_local_checkpoint(
+            self._filename,
+            {
+                "context": self._context.digest(),
+                "entries": list(self._entries.items()),
+            },
+        )
+        logger.opt(lazy=True).info(
+            "Saved {} fitness cache entries, hit rate {:.1%}",
+            lambda: len(self._entries),
+            lambda: self._total_hits
+            / max(self._total_hits + self._total_misses, 1),
+        )
+
+    def load(self, dm: DataManager):
+        """
+        Loads the entries saved in the run directory of the data manager,
+        entries saved for another simulation context are ignored.
+        """
+        try:
+            data = dm.load_local_dat_file(self._filename)
+        except FileNotFoundError:
+            return
+
+        if data["context"] != self._context.digest():
+            return
+
+        for key, (fitness, props) in data["entries"]:
+            self.put(key, fitness, props)
@@ -0,0 +1,100 @@
+import numpy as np
+
+
+class ObservationBuffer:
+    """
+    Preallocated ring buffer holding the observations of a simulation.
+
+    Each observation is a record of a NumPy structured array with the
+    following fields: position, link_rotations, distance, joints_at_limits,
+    trunk_hit_ground and legs_hit_ground.
+
+    When more observations than the capacity are appended, the oldest ones
+    are overwritten, except for the first observation which is always kept
+    since it is the reference of the simulation.
+    """
+
+    def __init__(self, capacity: int, nb_motors: int):
+        self._dtype = np.dtype(
+            [
+                ("position", np.float64, (3,)),
+                ("link_rotations", np.float64, (nb_motors,)),
+                ("distance", np.float64),
+                ("joints_at_limits", np.int32),
+                ("trunk_hit_ground", np.bool_),
+                ("legs_hit_ground", np.bool_),
+            ]
+        )
+        self._data = np.zeros(max(capacity, 2), dtype=self._dtype)
+        self._first = np.zeros(1, dtype=self._dtype)
+        self._count = 0
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def capacity(self):
+        return len(self._data)
+
+    @property
+    def first(self):
+        return self._first[0]
+
+    @property
+    def last(self):
+        return self[-1]
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self._count
+        if index < 0 or index >= self._count:
+            raise IndexError("observation index out of range")
+
+        if index == 0:
+            return self._first[0]
+        if index < self._count - len(self._data):
+            raise IndexError(f"observation {index} has been overwritten")
+
+        return self._data[index % len(self._data)]
+
+    def clear(self):
+        self._count = 0
+
+    def append(
+        self,
+        position: tuple,
+        link_rotations: list,
+        distance: float,
+        joints_at_limits: int,
+        trunk_hit_ground: bool,
+        legs_hit_ground: bool,
+    ):
+        index = self._count % len(self._data)
+        self._data[index] = (
+            position,
+            link_rotations,
+            distance,
+            joints_at_limits,
+            trunk_hit_ground,
+            legs_hit_ground,
+        )
+        if self._count == 0:
+            self._first[0] = self._data[index]
+
+        self._count += 1
+
+    def view(self):
+        """
+        Returns the observations still held by the buffer in chronological
+        order. The returned array is a view of the buffer as long as it has
+        not wrapped around, otherwise it is a copy.
+        """
+        if self._count <= len(self._data):
+            return self._data[: self._count]
+
+        index = self._count % len(self._data)
+        return np.concatenate((self._data[index:], self._data[:index]))
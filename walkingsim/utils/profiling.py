@@ -0,0 +1,174 @@
+"""
+Opt-in timers measuring how the time of a training is split between the
+phases of a simulation (forces, dynamics, observations, fitness, logs, ...).
+
+Profiling is enabled with `PROFILER.enable()`, which also sets the
+`WALKINGSIM_PROFILE` environment variable so that the worker processes
+started afterwards profile as well. When disabled, `PROFILER.phase` returns
+a shared no-op context manager, so an instrumented phase only costs a call.
+"""
+import collections
+import os
+import time
+
+import numpy as np
+
+from walkingsim.utils.data_manager import DataManager
+
+_ENV_VAR = "WALKINGSIM_PROFILE"
+
+# Edges of the histograms in nanoseconds, 4 buckets per decade from 1us to
+# 10s. Shorter and longer durations fall in the first and last buckets.
+HISTOGRAM_EDGES = np.logspace(3, 10, 29)
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("_samples", "_start")
+
+    def __init__(self, samples: list):
+        self._samples = samples
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self._samples.append(time.perf_counter_ns() - self._start)
+        return False
+
+
+class Profiler:
+    """
+    Collects the duration (in nanoseconds) of every execution of each phase
+    until the samples are popped.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self._enabled = enabled
+        self._samples = collections.defaultdict(list)
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    def enable(self, enabled: bool = True):
+        self._enabled = enabled
+        if enabled:
+            os.environ[_ENV_VAR] = "1"
+        else:
+            os.environ.pop(_ENV_VAR, None)
+
+    def phase(self, name: str):
+        """Context manager timing the phase `name`"""
+        if not self._enabled:
+            return _NULL_PHASE
+
+        return _Phase(self._samples[name])
+
+    def pop_samples(self) -> dict:
+        """Returns the samples collected since the last call and clears them"""
+        samples = dict(self._samples)
+        self._samples.clear()
+        return samples
+
+    def merge(self, samples: dict):
+        """Adds samples collected by another process"""
+        for name, durations in samples.items():
+            self._samples[name].extend(durations)
+
+
+PROFILER = Profiler(os.environ.get(_ENV_VAR) == "1")
+
+
+def summarize(samples: dict) -> dict:
+    """
+    Aggregates the samples of each phase: number of calls, total, mean,
+    median, 99th percentile and maximum durations (in seconds), along with
+    the histogram of the durations over `HISTOGRAM_EDGES`.
+    """
+    summary = {}
+    for name, durations in samples.items():
+        if len(durations) == 0:
+            continue
+
+        durations = np.asarray(durations, dtype=np.int64)
+        buckets = np.searchsorted(HISTOGRAM_EDGES, durations)
+        p50, p99 = np.percentile(durations, (50, 99)) * 1e-9
+        summary[name] = {
+            "calls": len(durations),
+            "total": durations.sum() * 1e-9,
+            "mean": durations.mean() * 1e-9,
+            "p50": p50,
+            "p99": p99,
+            "max": durations.max() * 1e-9,
+            "histogram": np.bincount(
+                buckets, minlength=len(HISTOGRAM_EDGES) + 1
+            ),
+        }
+
+    return summary
+
+
+class ProfileLog:
+    """
+    Aggregates the samples of each period of a training (a generation, a
+    rollout, ...). The statistics are logged in `profile.csv` and the
+    histograms are saved in `profile.dat`.
+    """
+
+    _headers = [
+        "period",
+        "phase",
+        "calls",
+        "total",
+        "mean",
+        "p50",
+        "p99",
+        "max",
+    ]
+
+    def __init__(self, dm: DataManager, period: str):
+        self._dm = dm
+        self._period = period
+        self._histograms = {}
+
+    def record(self, period: int):
+        """Aggregates the samples collected since the last period"""
+        summary = summarize(PROFILER.pop_samples())
+        if len(summary) == 0:
+            return
+
+        self._histograms[period] = {}
+        for phase, stats in summary.items():
+            self._histograms[period][phase] = stats.pop("histogram")
+            self._dm.save_log_file(
+                "profile.csv",
+                self._headers,
+                dict(stats, period=period, phase=phase),
+            )
+
+    def save(self):
+        if len(self._histograms) == 0:
+            return
+
+        self._dm.save_local_dat_file(
+            "profile.dat",
+            {
+                "period": self._period,
+                "edges": HISTOGRAM_EDGES,
+                "histograms": self._histograms,
+            },
+        )
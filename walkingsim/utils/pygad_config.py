@@ -26,3 +26,29 @@ class PygadConfig(NamedTuple):
     num_joints: int
     # Timesteps
     timesteps: int
+    # Genomes stored as int8 indices of the gene space
+    quantize: bool = False
+    # Parallel evaluation
+    workers: int = 1
+    # Fitness cache
+    cache_size: int = 4096
+    persist_cache: bool = False
+    # Generations between two checkpoints (0 to disable)
+    checkpoint_interval: int = 1
+    # Pruning of the individuals that cannot reach the top of the population
+    prune: bool = False
+    prune_checkpoints: int = 4
+    prune_top_k: int = None  # Defaults to keep_elitism
+    prune_max_speed: float = 2.0
+    # Genome encoding (raw | fourier), the Fourier encoding evolves the
+    # coefficients of a periodic gait instead of the forces themselves
+    encoding: str = "raw"
+    harmonics: int = 2
+    max_periods: int = 4
+    # Multi-fidelity evaluation, the individuals are screened at a coarse
+    # timestep and only the best fraction is simulated at the fine timestep
+    coarse_timestep: float = None  # Disabled when None
+    coarse_duration: float = None  # Defaults to the duration
+    promote_fraction: float = 0.25
+    # Seed of pygad (NumPy and random), the run is random when None
+    random_seed: int = None
@@ -0,0 +1,178 @@
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from walkingsim.utils.data_manager import DataManager
+
+
+class RunIndex:
+    """
+    SQLite index of the saved runs of an algorithm, stored in
+    `solutions/<group>/index.sqlite`.
+
+    Each run is recorded when it is saved, in a single transaction, so that
+    several trainings can save concurrently. Looking for the best or the
+    last run only queries the index instead of loading every run.
+    """
+
+    _filename = "index.sqlite"
+    _schema = """
+        CREATE TABLE IF NOT EXISTS runs (
+            date TEXT PRIMARY KEY,
+            saved_at REAL NOT NULL,
+            creature TEXT,
+            env TEXT,
+            fitness TEXT,
+            best_fitness REAL,
+            config_hash TEXT,
+            files TEXT,
+            seed INTEGER
+        )
+    """
+    # Columns added after the first version of the index
+    _added_columns = {"seed": "INTEGER"}
+
+    def __init__(self, group: str, timeout: float = 30.0):
+        self._group = group
+        self._root_dir = os.path.join("solutions", group)
+        self._path = os.path.join(self._root_dir, self._filename)
+        self._timeout = timeout
+
+    @property
+    def path(self):
+        return self._path
+
+    def exists(self):
+        return os.path.exists(self._path)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        os.makedirs(self._root_dir, exist_ok=True)
+        # The timeout makes concurrent writers wait for the lock instead of
+        # failing right away.
+        conn = sqlite3.connect(self._path, timeout=self._timeout)
+        try:
+            conn.row_factory = sqlite3.Row
+            with conn:
+                conn.execute(self._schema)
+                columns = {
+                    row["name"]
+                    for row in conn.execute("PRAGMA table_info(runs)")
+                }
+                for name, type_ in self._added_columns.items():
+                    if name not in columns:
+                        conn.execute(
+                            f"ALTER TABLE runs ADD COLUMN {name} {type_}"
+                        )
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def hash_config(config) -> str:
+        if hasattr(config, "_asdict"):
+            config = config._asdict()
+
+        return hashlib.blake2b(
+            json.dumps(config, sort_keys=True, default=str).encode(),
+            digest_size=8,
+        ).hexdigest()
+
+    def add(
+        self,
+        date: str,
+        *,
+        creature: str,
+        env: dict,
+        fitness: str,
+        best_fitness: float = None,
+        config=None,
+        files: list = None,
+        seed: int = None,
+    ):
+        """Records a run, replacing any previous record of the same date"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO runs (date, saved_at, creature, env, "
+                "fitness, best_fitness, config_hash, files, seed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    date,
+                    time.time(),
+                    creature,
+                    json.dumps(env, sort_keys=True),
+                    fitness,
+                    None if best_fitness is None else float(best_fitness),
+                    None if config is None else self.hash_config(config),
+                    json.dumps(files or []),
+                    seed,
+                ),
+            )
+
+    def runs(self) -> list:
+        """Every indexed run, the most recent first"""
+        if not self.exists():
+            return []
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM runs ORDER BY saved_at DESC"
+            ).fetchall()
+
+        return [
+            dict(
+                row,
+                env=json.loads(row["env"]),
+                files=json.loads(row["files"]),
+            )
+            for row in rows
+        ]
+
+    def best(self) -> str:
+        """Date of the run with the best fitness, None if there is none"""
+        return self._select_date(
+            "SELECT date FROM runs WHERE best_fitness IS NOT NULL "
+            "ORDER BY best_fitness DESC LIMIT 1"
+        )
+
+    def last(self) -> str:
+        """Date of the last saved run, None if there is none"""
+        return self._select_date(
+            "SELECT date FROM runs ORDER BY saved_at DESC LIMIT 1"
+        )
+
+    def resolve(self, date: str = None) -> str:
+        """
+        Resolves the date of a run: None or `last` is the last saved run and
+        `best` is the run with the best fitness. The global `.dat` files are
+        used when the index doesn't exist yet, a `RuntimeError` is raised
+        when no run is found.
+        """
+        if date not in (None, "last", "best"):
+            return date
+
+        resolved = self.best() if date == "best" else self.last()
+        if resolved is None:
+            filename = "best_sim.dat" if date == "best" else "last_sim.dat"
+            dm = DataManager(self._group, fail_if_exists=False)
+            try:
+                resolved = dm.load_global_dat_file(filename)
+            except FileNotFoundError as e:
+                raise RuntimeError(
+                    f"No {self._group} run recorded"
+                    + (" with a fitness" if date == "best" else "")
+                ) from e
+
+        return resolved
+
+    def _select_date(self, query: str):
+        if not self.exists():
+            return None
+
+        with self._connect() as conn:
+            row = conn.execute(query).fetchone()
+
+        return None if row is None else row["date"]
@@ -0,0 +1,9 @@
+import numpy as np
+
+
+def spawn_seeds(seed: int, n: int) -> list:
+    """Seeds of `n` independent streams derived from the seed of a run"""
+    return [
+        int(child.generate_state(1)[0])
+        for child in np.random.SeedSequence(seed).spawn(n)
+    ]